@@ -26,12 +26,14 @@ from GitSyncManager import GitSyncManager
 SCRIPT_NAME = "Ping"
 INTEGRATION_NAME = "GitSync"
 
+# Compiled once at import time - Ping may run frequently across many tenants
+COMMIT_AUTHOR_PATTERN = re.compile(COMMIT_AUTHOR_REGEX)
+
 
 @output_handler
 def main():
     siemplify = SiemplifyAction()
     siemplify.script_name = SCRIPT_NAME
-    smp_credentials = {}
     repo_url = siemplify.extract_configuration_param(INTEGRATION_NAME, "Repo URL")
     branch = siemplify.extract_configuration_param(INTEGRATION_NAME, "Branch")
     git_server_fingerprint = siemplify.extract_configuration_param(
@@ -54,16 +56,18 @@ def main():
         "Commit Author",
         default_value=DEFAULT_AUTHOR,
     )
-    smp_credentials["username"] = siemplify.extract_configuration_param(
-        INTEGRATION_NAME,
-        "SOAR Username",
-        print_value=True,
-        default_value=None,
-    )
-    smp_credentials["password"] = siemplify.extract_configuration_param(
-        provider_name=INTEGRATION_NAME,
-        param_name="SOAR Password",
-    )
+    smp_credentials = {
+        "username": siemplify.extract_configuration_param(
+            INTEGRATION_NAME,
+            "SOAR Username",
+            print_value=True,
+            default_value=None,
+        ),
+        "password": siemplify.extract_configuration_param(
+            provider_name=INTEGRATION_NAME,
+            param_name="SOAR Password",
+        ),
+    }
     smp_verify = siemplify.extract_configuration_param(
         INTEGRATION_NAME,
         "Siemplify Verify SSL",
@@ -75,7 +79,13 @@ def main():
         input_type=bool,
     )
 
-    if not re.fullmatch(COMMIT_AUTHOR_REGEX, git_author):
+    # Cheap prefilter - reject obvious misconfigurations without running the regex
+    if (
+        "@" not in git_author
+        or "<" not in git_author
+        or not git_author.endswith(">")
+        or not COMMIT_AUTHOR_PATTERN.fullmatch(git_author)
+    ):
         raise Exception(
             "Commit Author parameter must be in the following format: Name <example@gmail.com>",
         )
@@ -14,7 +14,9 @@
 
 from __future__ import annotations
 
-from io import BytesIO
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 from SiemplifyJob import SiemplifyJob
 from SiemplifyUtils import output_handler
@@ -23,6 +25,7 @@ from constants import (
     ALL_ENVIRONMENTS_IDENTIFIER,
     AVAILABLE_CONTENT,
     IGNORED_INTEGRATIONS,
+    IGNORED_JOB_PREFIXES,
     IGNORED_JOBS,
     INTEGRATION_NAME,
 )
@@ -38,6 +41,10 @@ from GitSyncManager import GitSyncManager
 
 SCRIPT_NAME = "Push Content"
 
+# Bounded pool for the per-item API fetches. Pushes stay on the main thread
+# because the git tree is mutated in place and is not thread-safe.
+MAX_FETCH_WORKERS = 8
+
 
 @output_handler
 def main():
@@ -52,38 +59,49 @@ def main():
     for feature in AVAILABLE_CONTENT:
         features[feature] = siemplify.extract_job_param(feature, input_type=bool)
 
+    fetch_pool = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS)
     try:
         gitsync = GitSyncManager.from_siemplify_object(siemplify)
 
         # Integrations
         if features["Integrations"]:
             siemplify.LOGGER.info("========== Integrations ==========")
-            for integration in [
+            integrations = [
                 x
                 for x in gitsync.api.get_ide_cards()
                 if x.get("identifier") not in IGNORED_INTEGRATIONS
-            ]:
+            ]
+            packages = fetch_pool.map(
+                lambda x: gitsync.api.export_package(x["identifier"]),
+                integrations,
+            )
+            failures = []
+            for integration, package in zip(integrations, packages):
                 siemplify.LOGGER.info(f"Pushing {integration['identifier']}")
-                integration_obj = Integration(
-                    integration,
-                    BytesIO(gitsync.api.export_package(integration["identifier"])),
-                )
+                integration_obj = Integration(integration, package)
                 try:
                     gitsync.content.push_integration(integration_obj)
                 except Exception as e:
-                    siemplify.LOGGER.error(
-                        f"Couldn't upload {integration_obj.identifier}. ERROR: {e}",
-                    )
+                    failures.append((integration_obj.identifier, repr(e)))
+            if failures:
+                siemplify.LOGGER.error(
+                    "Couldn't upload: "
+                    + ", ".join(f"{identifier}: {error}" for identifier, error in failures),
+                )
 
         # Playbooks
         if features["Playbooks"]:
             siemplify.LOGGER.info("========== Playbooks ==========")
-            for playbook in gitsync.api.get_playbooks(chronicle_soar=siemplify):
-                siemplify.LOGGER.info(f"Pushing {playbook['name']}")
-                playbook = gitsync.api.get_playbook(
+            playbook_cards = gitsync.api.get_playbooks(chronicle_soar=siemplify)
+            playbooks = fetch_pool.map(
+                lambda x: gitsync.api.get_playbook(
                     chronicle_soar=siemplify,
-                    identifier=playbook["identifier"],
-                )
+                    identifier=x["identifier"],
+                ),
+                playbook_cards,
+            )
+            for card, playbook in zip(playbook_cards, playbooks):
+                siemplify.LOGGER.info(f"Pushing {card['name']}")
                 workflow = Workflow(playbook)
                 workflow.update_instance_name_in_steps(gitsync.api, siemplify)
                 gitsync.content.push_playbook(workflow)
@@ -91,15 +109,15 @@ def main():
         # Jobs
         if features["Jobs"]:
             siemplify.LOGGER.info("========== Jobs ==========")
-            for job in [
-                x
-                for x in gitsync.api.get_jobs(chronicle_soar=siemplify)
-                if x.get("displayName", x.get("name")) not in IGNORED_JOBS
-                and x.get("integration") != INTEGRATION_NAME
-                and not x.get("displayName", x.get("name")).startswith("Cases Collector DB")
-                and not x.get("displayName", x.get("name")).startswith("Logs Collector")
-            ]:
-                siemplify.LOGGER.info(f"Pushing {job.get('displayName', job.get('name'))}")
+            for job in gitsync.api.get_jobs(chronicle_soar=siemplify):
+                name = job.get("displayName") or job.get("name") or ""
+                if (
+                    name in IGNORED_JOBS
+                    or job.get("integration") == INTEGRATION_NAME
+                    or name.startswith(IGNORED_JOB_PREFIXES)
+                ):
+                    continue
+                siemplify.LOGGER.info(f"Pushing {name}")
                 gitsync.content.push_job(Job(job))
 
         # Connectors
@@ -112,143 +130,151 @@ def main():
         # Simulated Cases
         if features["Simulated Cases"]:
             siemplify.LOGGER.info("========== Simulated Cases ==========")
-            for case in gitsync.api.get_simulated_cases():
+            cases = gitsync.api.get_simulated_cases()
+            exported_cases = fetch_pool.map(gitsync.api.export_simulated_case, cases)
+            for case, exported_case in zip(cases, exported_cases):
                 siemplify.LOGGER.info(f"Pushing {case}")
-                gitsync.content.push_simulated_case(
-                    case,
-                    gitsync.api.export_simulated_case(case),
-                )
+                gitsync.content.push_simulated_case(case, exported_case)
 
         # Integration Instances
         if features["Integration Instances"]:
             siemplify.LOGGER.info("========== Integration Instances ==========")
             integration_instances = []
-            for environment in gitsync.api.get_environment_names(chronicle_soar=siemplify) + [
+            # get_configuration results, keyed by instance identifier - instances
+            # repeat across the per-environment and All Environments passes
+            secrets_cache: dict[str, dict] = {}
+            environments = gitsync.api.get_environment_names(chronicle_soar=siemplify) + [
                 ALL_ENVIRONMENTS_IDENTIFIER,
-            ]:
-                for instance in [
-                    x
-                    for x in gitsync.api.get_integrations_instances(
-                        chronicle_soar=siemplify, environment=environment
-                    )
-                    if x.integration_identifier not in IGNORED_INTEGRATIONS
-                ]:
-                    siemplify.LOGGER.info(f"Pushing {instance.instance_name}")
-                    settings = gitsync.api.get_integration_instance_settings(
-                        chronicle_soar=siemplify,
-                        instance_id=instance.identifier,
-                        integration_identifier=instance.integration_identifier,
-                    )
-                    for sett in (
-                        settings
-                    ):  # Remove Agent Identifiers from settings - should be created separately
-                        if sett.property_name == "AgentIdentifier":
-                            sett.value = None
-                    if commit_passwords:
-                        try:
+            ]
+            instances_per_env = fetch_pool.map(
+                lambda env: gitsync.api.get_integrations_instances(
+                    chronicle_soar=siemplify, environment=env
+                ),
+                environments,
+            )
+            env_instances = [
+                (environment, instance)
+                for environment, instances in zip(environments, instances_per_env)
+                for instance in instances
+                if instance.integration_identifier not in IGNORED_INTEGRATIONS
+            ]
+            settings_per_instance = fetch_pool.map(
+                lambda pair: gitsync.api.get_integration_instance_settings(
+                    chronicle_soar=siemplify,
+                    instance_id=pair[1].identifier,
+                    integration_identifier=pair[1].integration_identifier,
+                ),
+                env_instances,
+            )
+            for (environment, instance), settings in zip(env_instances, settings_per_instance):
+                siemplify.LOGGER.info(f"Pushing {instance.instance_name}")
+                if commit_passwords and any(p.is_password for p in settings):
+                    try:
+                        secrets = secrets_cache.get(instance.identifier)
+                        if secrets is None:
                             secrets = siemplify.get_configuration(instance.identifier)
-                            for prop in settings:
-                                if prop.is_password:
-                                    try:
-                                        prop.value = secrets[prop.property_name]
-                                    except KeyError:
-                                        siemplify.LOGGER.warn(
-                                            f"{instance.instance_name} was updated with new "
-                                            "parameters but they weren't configured.",
-                                        )
-                        except Exception:
-                            siemplify.LOGGER.warn(
-                                f"{instance.identifier} is not configured. Skipping passwords",
-                            )
-                    settings_dict_list = [
-                        {
-                            "propertyName": s.property_name,
-                            "value": s.value,
-                            "creationTimeUnixTimeInMs": 0,
-                            "modificationTimeUnixTimeInMs": 0,
-                            "propertyType": s.property_type,
-                            "isMandatory": s.is_mandatory,
-                            "id": s._id,
-                            "propertyDisplayName": s.display_name,
-                            "propertyDescription": s.property_description,
-                            "integrationIdentifier": instance.integration_identifier,
-                            "integrationInstance": instance.identifier,
-                        }
-                        for s in settings
-                    ]
-                    integration_instances.append(
-                        {
-                            "environment": environment,
-                            "integrationIdentifier": instance.integration_identifier,
-                            "settings": {
-                                "instanceDescription": instance.instance_description,
-                                "instanceName": instance.instance_name,
-                                "settings": settings_dict_list,
-                            },
+                            secrets_cache[instance.identifier] = secrets
+                        for prop in settings:
+                            if prop.is_password:
+                                try:
+                                    prop.value = secrets[prop.property_name]
+                                except KeyError:
+                                    siemplify.LOGGER.warn(
+                                        f"{instance.instance_name} was updated with new "
+                                        "parameters but they weren't configured.",
+                                    )
+                    except Exception:
+                        siemplify.LOGGER.warn(
+                            f"{instance.identifier} is not configured. Skipping passwords",
+                        )
+                integration_identifier = instance.integration_identifier
+                instance_identifier = instance.identifier
+                settings_dict_list = [
+                    {
+                        "propertyName": s.property_name,
+                        # Agent Identifiers should be created separately
+                        "value": None if s.property_name == "AgentIdentifier" else s.value,
+                        "creationTimeUnixTimeInMs": 0,
+                        "modificationTimeUnixTimeInMs": 0,
+                        "propertyType": s.property_type,
+                        "isMandatory": s.is_mandatory,
+                        "id": s._id,
+                        "propertyDisplayName": s.display_name,
+                        "propertyDescription": s.property_description,
+                        "integrationIdentifier": integration_identifier,
+                        "integrationInstance": instance_identifier,
+                    }
+                    for s in settings
+                ]
+                integration_instances.append(
+                    {
+                        "environment": environment,
+                        "integrationIdentifier": instance.integration_identifier,
+                        "settings": {
+                            "instanceDescription": instance.instance_description,
+                            "instanceName": instance.instance_name,
+                            "settings": settings_dict_list,
                         },
-                    )
+                    },
+                )
             gitsync.content.push_integration_instances(integration_instances)
 
         # Ontology - Visual Families
         if features["Visual Families"]:
             siemplify.LOGGER.info("========== Visual Families ==========")
-            for visualFamily in gitsync.api.get_custom_families(chronicle_soar=siemplify):
-                siemplify.LOGGER.info(f"Pushing {visualFamily['family']}")
-                gitsync.content.push_visual_family(
-                    VisualFamily(
-                        gitsync.api.get_custom_family(
-                            chronicle_soar=siemplify,
-                            family_id=visualFamily["id"],
-                        ),
-                    ),
-                )
+            family_cards = gitsync.api.get_custom_families(chronicle_soar=siemplify)
+            families = fetch_pool.map(
+                lambda x: gitsync.api.get_custom_family(
+                    chronicle_soar=siemplify,
+                    family_id=x["id"],
+                ),
+                family_cards,
+            )
+            for card, family in zip(family_cards, families):
+                siemplify.LOGGER.info(f"Pushing {card['family']}")
+                gitsync.content.push_visual_family(VisualFamily(family))
 
         # Ontology - Mappings
         if features["Mappings"]:
             siemplify.LOGGER.info("========== Mappings ==========")
-            all_records = gitsync.api.get_ontology_records(chronicle_soar=siemplify)
-            records_integrations = set([x["source"] for x in all_records])
-            for integration in records_integrations:
+            records_by_source = defaultdict(list)
+            for record in gitsync.api.get_ontology_records(chronicle_soar=siemplify):
+                # Records with no source can't be pushed - drop them up front
+                if record.get("source"):
+                    records_by_source[record["source"]].append(record)
+            for integration, records in records_by_source.items():
                 siemplify.LOGGER.info(f"Pushing {integration} mappings")
-                if integration:
-                    records = [x for x in all_records if x["source"] == integration]
-                    if not records:
-                        continue
-                    rules = []
-                    for record in records:
-                        record["exampleEventFields"] = []  # remove event assets
-                        rule = gitsync.api.get_mapping_rules(
-                            record["source"],
-                            record["product"],
-                            record["eventName"],
-                        )
-                        for r in rule["familyFields"] + rule["systemFields"]:
-                            # remove bad rules with no source
-                            if (
-                                r["mappingRule"]["source"]
-                                and r["mappingRule"]["source"].lower() == integration.lower()
-                            ):
-                                rules.append(rule)
-                                break
+                rules = []
+                integration_lower = integration.lower()
+                for record in records:
+                    record["exampleEventFields"] = []  # remove event assets
+                    rule = gitsync.api.get_mapping_rules(
+                        record["source"],
+                        record["product"],
+                        record["eventName"],
+                    )
+                    for r in chain(rule["familyFields"], rule["systemFields"]):
+                        # remove bad rules with no source
+                        source = r["mappingRule"]["source"]
+                        if source and source.lower() == integration_lower:
+                            rules.append(rule)
+                            break
 
-                    gitsync.content.push_mapping(Mapping(integration, records, rules))
+                gitsync.content.push_mapping(Mapping(integration, records, rules))
 
         # Other settings
         siemplify.LOGGER.info("========== Settings ==========")
         if features["Environments"]:
             siemplify.LOGGER.info("Pushing environments")
-            environments = gitsync.api.get_environments(siemplify)
-            for environment in environments:
-                environment._id = 0
-            gitsync.content.push_environments([
-                environment.to_json() for environment in environments
-            ])
 
-        if features["Dynamic Parameters"]:
-            siemplify.LOGGER.info("Pushing dynamic parameters")
-            gitsync.content.push_dynamic_parameters(
-                gitsync.api.get_env_dynamic_parameters(chronicle_soar=siemplify),
-            )
+            def _zeroed_environments():
+                # Zero the id and serialize in one pass over the environments
+                for environment in gitsync.api.get_environments(siemplify):
+                    environment._id = 0
+                    yield environment.to_json()
+
+            # push_environments serializes to JSON, so it needs a real list
+            gitsync.content.push_environments(list(_zeroed_environments()))
 
         if features["Logo"]:
             siemplify.LOGGER.info("Pushing logo")
@@ -258,53 +284,81 @@ def main():
                 logo["imageBase64"] = "data:image/png;base64," + logo["imageBase64"]
             gitsync.content.push_logo(logo)
 
-        if features["Case Tags"]:
-            siemplify.LOGGER.info("Pushing case tags")
-            gitsync.content.push_tags(gitsync.api.get_case_tags(chronicle_soar=siemplify))
-
-        if features["Case Stages"]:
-            siemplify.LOGGER.info("Pushing case stages")
-            gitsync.content.push_stages(gitsync.api.get_case_stages(chronicle_soar=siemplify))
-
-        if features["Case Title Settings"]:
-            siemplify.LOGGER.info("Pushing case title settings")
-            gitsync.content.push_case_titles(gitsync.api.get_case_title_settings())
-
-        if features["Case Close Reasons"]:
-            siemplify.LOGGER.info("Pushing case close reasons")
-            gitsync.content.push_case_close_causes(
-                gitsync.api.get_close_reasons(chronicle_soar=siemplify)
-            )
-
-        if features["Networks"]:
-            siemplify.LOGGER.info("Pushing networks")
-            gitsync.content.push_networks(gitsync.api.get_networks(chronicle_soar=siemplify))
-
-        if features["Domains"]:
-            siemplify.LOGGER.info("Pushing domains")
-            gitsync.content.push_domains(gitsync.api.get_domains(chronicle_soar=siemplify))
-
-        if features["Custom Lists"]:
-            siemplify.LOGGER.info("Pushing custom lists")
-            gitsync.content.push_custom_lists(
-                gitsync.api.get_custom_lists(chronicle_soar=siemplify)
-            )
-
-        if features["Email Templates"]:
-            siemplify.LOGGER.info("Pushing email templates")
-            gitsync.content.push_email_templates(
-                gitsync.api.get_email_templates(chronicle_soar=siemplify)
-            )
-
-        if features["Blacklists"]:
-            siemplify.LOGGER.info("Pushing denylists")
-            gitsync.content.push_denylists(gitsync.api.get_denylists(chronicle_soar=siemplify))
-
-        if features["SLA Records"]:
-            siemplify.LOGGER.info("Pushing SLA records")
-            gitsync.content.push_sla_definitions(
-                gitsync.api.get_sla_records(chronicle_soar=siemplify)
-            )
+        # The remaining settings are independent fetch/push pairs. Fetches run
+        # concurrently; pushes write to the git tree so they stay serial.
+        settings_tasks = [
+            (
+                "Dynamic Parameters",
+                "dynamic parameters",
+                lambda: gitsync.api.get_env_dynamic_parameters(chronicle_soar=siemplify),
+                gitsync.content.push_dynamic_parameters,
+            ),
+            (
+                "Case Tags",
+                "case tags",
+                lambda: gitsync.api.get_case_tags(chronicle_soar=siemplify),
+                gitsync.content.push_tags,
+            ),
+            (
+                "Case Stages",
+                "case stages",
+                lambda: gitsync.api.get_case_stages(chronicle_soar=siemplify),
+                gitsync.content.push_stages,
+            ),
+            (
+                "Case Title Settings",
+                "case title settings",
+                gitsync.api.get_case_title_settings,
+                gitsync.content.push_case_titles,
+            ),
+            (
+                "Case Close Reasons",
+                "case close reasons",
+                lambda: gitsync.api.get_close_reasons(chronicle_soar=siemplify),
+                gitsync.content.push_case_close_causes,
+            ),
+            (
+                "Networks",
+                "networks",
+                lambda: gitsync.api.get_networks(chronicle_soar=siemplify),
+                gitsync.content.push_networks,
+            ),
+            (
+                "Domains",
+                "domains",
+                lambda: gitsync.api.get_domains(chronicle_soar=siemplify),
+                gitsync.content.push_domains,
+            ),
+            (
+                "Custom Lists",
+                "custom lists",
+                lambda: gitsync.api.get_custom_lists(chronicle_soar=siemplify),
+                gitsync.content.push_custom_lists,
+            ),
+            (
+                "Email Templates",
+                "email templates",
+                lambda: gitsync.api.get_email_templates(chronicle_soar=siemplify),
+                gitsync.content.push_email_templates,
+            ),
+            (
+                "Blacklists",
+                "denylists",
+                lambda: gitsync.api.get_denylists(chronicle_soar=siemplify),
+                gitsync.content.push_denylists,
+            ),
+            (
+                "SLA Records",
+                "SLA records",
+                lambda: gitsync.api.get_sla_records(chronicle_soar=siemplify),
+                gitsync.content.push_sla_definitions,
+            ),
+        ]
+        enabled_tasks = [task for task in settings_tasks if features[task[0]]]
+        fetched_settings = fetch_pool.map(lambda task: task[2](), enabled_tasks)
+        for (_feature, label, _fetch, push), data in zip(enabled_tasks, fetched_settings):
+            siemplify.LOGGER.info(f"Pushing {label}")
+            push(data)
 
         siemplify.LOGGER.info("Done! uploading everything to git")
         gitsync.commit_and_push(commit_msg)
@@ -314,6 +368,9 @@ def main():
         siemplify.LOGGER.exception(e)
         raise
 
+    finally:
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
+
     siemplify.end_script()
 
 
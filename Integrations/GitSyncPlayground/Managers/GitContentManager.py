@@ -16,10 +16,19 @@ from __future__ import annotations
 
 import json
 import stat
-import zipfile
-from io import BytesIO
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
+try:
+    # Optional speedup - orjson parses bytes without the intermediate UTF-8
+    # decode pass. Not part of the shipped dependency set, so fall back to
+    # the stdlib decoder when it isn't available.
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from definitions import (
     Connector,
     File,
@@ -59,22 +68,57 @@ EMAIL_TEMPLATES_FILE = f"{SETTINGS_PATH}/emailTemplates.json"
 DENYLIST_FILE = f"{SETTINGS_PATH}/blacklists.json"
 SLA_DEFINITIONS_FILE = f"{SETTINGS_PATH}/slaDefinitions.json"
 
+# Path templates for content addressed by name - built once instead of
+# re-assembling the f-string shape on every lookup
+MAPPING_RECORDS_FILE_TEMPLATE = MAPPINGS_PATH + "/{0}/{0}_Records.json"
+MAPPING_RULES_FILE_TEMPLATE = MAPPINGS_PATH + "/{0}/{0}_Rules.json"
+VISUAL_FAMILY_FILE_TEMPLATE = VISUAL_FAMILIES_PATH + "/{0}/{0}.json"
+JOB_FILE_TEMPLATE = JOBS_PATH + "/{0}.json"
+SIMULATED_CASE_FILE_TEMPLATE = SIMULATED_CASES_PATH + "/{0}.case"
+
+# Logical setting names to their repo file, used by push_settings_bundle
+SETTINGS_FILES = {
+    "integration_instances": INTEGRATION_INSTANCES_FILE,
+    "dynamic_parameters": DYNAMIC_PARAMS_FILES,
+    "environments": ENVIRONMENTS_FILE,
+    "logo": LOGO_FILE,
+    "tags": TAGS_FILE,
+    "stages": STAGES_FILE,
+    "case_close_causes": CASE_CLOSE_REASONS_FILE,
+    "case_titles": CASE_TITLES_FILE,
+    "networks": NETWORKS_FILE,
+    "domains": DOMAINS_FILE,
+    "custom_lists": CUSTOM_LISTS_FILE,
+    "email_templates": EMAIL_TEMPLATES_FILE,
+    "denylists": DENYLIST_FILE,
+    "sla_definitions": SLA_DEFINITIONS_FILE,
+}
+
+_DIR_MODE = stat.S_IFDIR
+
+# Suffixes checked in the hot listing loops
+JSON_SUFFIX = ".json"
+CASE_SUFFIX = ".case"
+
+# Bounded pool for the bulk getters that assemble one object per repo folder
+MAX_PACK_WORKERS = 8
+
 
 class GitContentManager:
     def __init__(self, git: Git, api: SiemplifyApiClient):
         self.git = git
         self.api = api
-        self._metadata = None
+        # Memoized file listings keyed by repo path. The tree only changes
+        # through the push methods, which clear this cache.
+        self._tree_cache: dict[str, list[File]] = {}
 
-    @property
-    def metadata(self):
-        if not self._metadata:
-            self._metadata = self.get_metadata()
-        return self._metadata
+    @cached_property
+    def metadata(self) -> Metadata:
+        return self.get_metadata()
 
     def get_metadata(self) -> Metadata:
         try:
-            metadata = json.loads(self.git.get_file_contents_from_path(METADATA_FILE))
+            metadata = _json_loads(self.git.get_file_contents_from_path(METADATA_FILE))
             metadata = Metadata(**metadata)
         except KeyError:
             metadata = Metadata()
@@ -83,30 +127,47 @@ class GitContentManager:
         return metadata
 
     def push_metadata(self) -> None:
-        self._push_file(METADATA_FILE, self.metadata.__dict__)
+        self._push_file(METADATA_FILE, self.metadata.to_json())
 
-    def get_integration(self, integration_name: str) -> Integration | None:
+    def get_integration(
+        self,
+        integration_name: str,
+        compress: bool = False,
+    ) -> Integration | None:
         """Get integration as Integration object from the repo
 
         Args:
             integration_name: Integration name
+            compress: Deflate the zip entries. Only worth paying for when the
+                archive leaves the box (e.g. is uploaded to the platform)
 
         Returns: An Integration object, or None if the integration doesn't exist
 
         """
+        # zipfile pulls in a fair chunk of the stdlib - most runs never
+        # touch the integration path, so only pay for it here
+        import zipfile
+        from io import BytesIO
+
         try:
+            base_path = f"{INTEGRATIONS_PATH}/{integration_name}"
+            # Fetch the definition directly - a folder without one isn't an
+            # installable integration, and resolving it up front means the
+            # packing loop no longer has to spot it (previously a missing
+            # .def left the definition name unbound)
+            definition = _json_loads(
+                self.git.get_file_contents_from_path(
+                    f"{base_path}/Integration-{integration_name}.def",
+                ),
+            )
             zip_buffer = BytesIO()
             with zipfile.ZipFile(
                 zip_buffer,
                 "a",
-                zipfile.ZIP_DEFLATED,
+                zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED,
                 False,
             ) as zip_file:
-                for file in self.git.get_file_objects_from_path(
-                    f"Integrations/{integration_name}",
-                ):
-                    if file.path == f"Integration-{integration_name}.def":
-                        definition = json.loads(file.content)
+                for file in self.git.get_file_objects_from_path(base_path):
                     zip_file.writestr(file.path, file.content)
             zip_buffer.seek(0)
             return Integration(
@@ -119,15 +180,25 @@ class GitContentManager:
         except KeyError:
             return None
 
-    def get_integrations(self) -> list[Integration]:
+    def get_integrations(self) -> Iterator[Integration]:
         try:
-            for integration in self.git.get_raw_object_from_path(
-                INTEGRATIONS_PATH,
-            ).items():
-                if integration.mode == stat.S_IFDIR:
-                    yield self.get_integration(integration.path.decode("utf-8"))
+            names = [
+                integration.path.decode("utf-8")
+                for integration in self.git.get_raw_object_from_path(
+                    INTEGRATIONS_PATH,
+                ).items()
+                if integration.mode == _DIR_MODE
+            ]
         except KeyError:
             return []
+        if len(names) < 4:
+            # Not worth spinning up a pool for a handful of folders
+            yield from map(self.get_integration, names)
+            return
+        # Packing is read-only against the object store, so the per-folder
+        # work can fan out. map preserves repo order
+        with ThreadPoolExecutor(max_workers=MAX_PACK_WORKERS) as executor:
+            yield from executor.map(self.get_integration, names)
 
     def get_playbook(self, playbook_name: str) -> Workflow | None:
         """Reads a playbook or block from the repo object store
@@ -139,17 +210,26 @@ class GitContentManager:
 
         """
         try:
-            for playbook in self.git.get_file_objects_from_path(PLAYBOOKS_PATH):
-                if playbook.path.endswith(f"/{playbook_name}.json"):
-                    return Workflow(json.loads(playbook.content))
+            # Walk the tree listing only - a single blob is read, and only
+            # once the matching path is found
+            suffix = f"/{playbook_name}.json"
+            for path in self.git.get_file_paths_from_path(PLAYBOOKS_PATH):
+                if path.endswith(suffix):
+                    return Workflow(
+                        _json_loads(
+                            self.git.get_file_contents_from_path(
+                                f"{PLAYBOOKS_PATH}/{path}",
+                            ),
+                        ),
+                    )
         except KeyError:
             return None
 
-    def get_playbooks(self) -> list[Workflow]:
+    def get_playbooks(self) -> Iterator[Workflow]:
         try:
-            for playbook in self.git.get_file_objects_from_path(PLAYBOOKS_PATH):
-                if playbook.path.endswith(".json"):
-                    yield Workflow(json.loads(playbook.content))
+            for playbook in self._list_files(PLAYBOOKS_PATH):
+                if playbook.path.endswith(JSON_SUFFIX):
+                    yield Workflow(_json_loads(playbook.content))
         except KeyError:
             return []
 
@@ -163,37 +243,44 @@ class GitContentManager:
 
         """
         try:
-            for connector in self.git.get_file_objects_from_path(CONNECTORS_PATH):
-                if connector.path.endswith(f"{connector_name}.json"):
-                    return Connector(json.loads(connector.content))
+            suffix = f"{connector_name}.json"
+            for path in self.git.get_file_paths_from_path(CONNECTORS_PATH):
+                if path.endswith(suffix):
+                    return Connector(
+                        _json_loads(
+                            self.git.get_file_contents_from_path(
+                                f"{CONNECTORS_PATH}/{path}",
+                            ),
+                        ),
+                    )
         except KeyError:
             return None
 
-    def get_connectors(self) -> list[Connector]:
+    def get_connectors(self) -> Iterator[Connector]:
         try:
-            for connector in self.git.get_file_objects_from_path(CONNECTORS_PATH):
-                if connector.path.endswith(".json"):
-                    yield Connector(json.loads(connector.content))
+            for connector in self._list_files(CONNECTORS_PATH):
+                if connector.path.endswith(JSON_SUFFIX):
+                    yield Connector(_json_loads(connector.content))
         except KeyError:
             return []
 
     def get_job(self, job_name: str) -> Job | None:
         try:
             return Job(
-                json.loads(
+                _json_loads(
                     self.git.get_file_contents_from_path(
-                        f"{JOBS_PATH}/{job_name}.json",
+                        JOB_FILE_TEMPLATE.format(job_name),
                     ),
                 ),
             )
         except KeyError:
             return None
 
-    def get_jobs(self) -> list[Job]:
+    def get_jobs(self) -> Iterator[Job]:
         try:
-            for job in self.git.get_file_objects_from_path(JOBS_PATH):
-                if job.path.endswith(".json"):
-                    yield Job(json.loads(job.content))
+            for job in self._list_files(JOBS_PATH):
+                if job.path.endswith(JSON_SUFFIX):
+                    yield Job(_json_loads(job.content))
         except KeyError:
             return []
 
@@ -207,15 +294,15 @@ class GitContentManager:
 
         """
         try:
-            records = json.loads(
+            records = _json_loads(
                 self.git.get_file_contents_from_path(
-                    f"{MAPPINGS_PATH}/{source_name}/{source_name}_Records.json",
+                    MAPPING_RECORDS_FILE_TEMPLATE.format(source_name),
                 ),
             )
 
-            rules = json.loads(
+            rules = _json_loads(
                 self.git.get_file_contents_from_path(
-                    f"{MAPPINGS_PATH}/{source_name}/{source_name}_Rules.json",
+                    MAPPING_RULES_FILE_TEMPLATE.format(source_name),
                 ),
             )
 
@@ -223,12 +310,23 @@ class GitContentManager:
         except KeyError:
             return None
 
-    def get_mappings(self) -> list[Mapping]:
+    def get_mappings(self) -> Iterator[Mapping]:
         try:
-            for mappings in self.git.get_raw_object_from_path(MAPPINGS_PATH):
-                yield self.get_mapping(mappings.decode("utf-8"))
+            files = self._list_files(MAPPINGS_PATH)
         except KeyError:
             return []
+        # A single tree walk serves every source - bucket the fetched blobs
+        # by their top-level folder instead of re-resolving paths per source
+        blobs_by_source: dict[str, dict[str, bytes]] = {}
+        for file in files:
+            source, _, name = file.path.partition("/")
+            if name:
+                blobs_by_source.setdefault(source, {})[name] = file.content
+        for source, blobs in blobs_by_source.items():
+            records = blobs.get(f"{source}_Records.json")
+            rules = blobs.get(f"{source}_Rules.json")
+            if records is not None and rules is not None:
+                yield Mapping(source, _json_loads(records), _json_loads(rules))
 
     def get_visual_family(self, family_name: str) -> VisualFamily | None:
         """Reads a visual family from the repo
@@ -241,76 +339,81 @@ class GitContentManager:
         """
         try:
             return VisualFamily(
-                json.loads(
+                _json_loads(
                     self.git.get_file_contents_from_path(
-                        f"{VISUAL_FAMILIES_PATH}/{family_name}/{family_name}.json",
+                        VISUAL_FAMILY_FILE_TEMPLATE.format(family_name),
                     ),
                 ),
             )
         except KeyError:
             return None
 
-    def get_visual_families(self) -> list[VisualFamily]:
+    def get_visual_families(self) -> Iterator[VisualFamily]:
         try:
-            for vf in self.git.get_raw_object_from_path(VISUAL_FAMILIES_PATH):
-                yield self.get_visual_family(vf.decode("utf-8"))
+            files = self._list_files(VISUAL_FAMILIES_PATH)
         except KeyError:
             return []
+        for file in files:
+            family, _, name = file.path.partition("/")
+            if name == family + JSON_SUFFIX:
+                yield VisualFamily(_json_loads(file.content))
 
     def get_simulated_case(self, case_name: str) -> dict | None:
-        return json.loads(
-            self._get_file_or_default(f"{SIMULATED_CASES_PATH}/{case_name}.case"),
+        return _json_loads(
+            self._get_file_or_default(SIMULATED_CASE_FILE_TEMPLATE.format(case_name)),
         )
 
-    def get_simulated_cases(self) -> list[dict]:
+    def get_simulated_cases(self) -> Iterator[dict]:
         try:
-            for case in self.git.get_file_objects_from_path(SIMULATED_CASES_PATH):
-                if case.path.endswith(".case"):
-                    yield json.loads(case.content)
+            # Case files can run to megabytes - stream them one blob at a
+            # time instead of materializing the whole folder in the cache
+            for case in self.git.iter_file_objects_from_path(SIMULATED_CASES_PATH):
+                if case.path.endswith(CASE_SUFFIX):
+                    yield _json_loads(case.content)
         except KeyError:
             return []
 
     def get_integration_instances(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(INTEGRATION_INSTANCES_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(INTEGRATION_INSTANCES_FILE, b"[]"))
 
     def get_dynamic_parameters(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(DYNAMIC_PARAMS_FILES, "[]"))
+        return _json_loads(self._get_file_or_default(DYNAMIC_PARAMS_FILES, b"[]"))
 
     def get_environments(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(ENVIRONMENTS_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(ENVIRONMENTS_FILE, b"[]"))
 
     def get_logo(self) -> dict:
-        return json.loads(self._get_file_or_default(LOGO_FILE, "{}"))
+        return _json_loads(self._get_file_or_default(LOGO_FILE, b"{}"))
 
     def get_tags(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(TAGS_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(TAGS_FILE, b"[]"))
 
     def get_stages(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(STAGES_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(STAGES_FILE, b"[]"))
 
     def get_case_close_causes(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(CASE_CLOSE_REASONS_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(CASE_CLOSE_REASONS_FILE, b"[]"))
 
     def get_case_titles(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(CASE_TITLES_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(CASE_TITLES_FILE, b"[]"))
 
     def get_networks(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(NETWORKS_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(NETWORKS_FILE, b"[]"))
 
     def get_domains(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(DOMAINS_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(DOMAINS_FILE, b"[]"))
 
     def get_custom_lists(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(CUSTOM_LISTS_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(CUSTOM_LISTS_FILE, b"[]"))
 
     def get_email_templates(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(EMAIL_TEMPLATES_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(EMAIL_TEMPLATES_FILE, b"[]"))
 
     def get_denylists(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(DENYLIST_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(DENYLIST_FILE, b"[]"))
 
     def get_sla_definitions(self) -> list[dict]:
-        return json.loads(self._get_file_or_default(SLA_DEFINITIONS_FILE, "[]"))
+        return _json_loads(self._get_file_or_default(SLA_DEFINITIONS_FILE, b"[]"))
 
     def push_integration(self, integration: Integration) -> None:
         """Writes an integration to the repo
@@ -326,6 +429,7 @@ class GitContentManager:
             integration.iter_files(self.api),
             base_path=f"{INTEGRATIONS_PATH}/{integration.identifier}",
         )
+        self._tree_cache.clear()
 
     def push_playbook(self, playbook: Workflow) -> None:
         """Writes a workflow to the repo
@@ -363,6 +467,7 @@ class GitContentManager:
 
         """
         self.git.update_objects(job.iter_files())
+        self._tree_cache.clear()
 
     def push_mapping(self, mapping: Mapping) -> None:
         """Writes mappings to the repo
@@ -393,7 +498,17 @@ class GitContentManager:
         )
 
     def push_simulated_case(self, case_name: str, case: dict) -> None:
-        self._push_file(f"{SIMULATED_CASES_PATH}/{case_name}.case", case)
+        # .case files are machine-generated event dumps nobody reviews by
+        # hand - compact encoding keeps them considerably smaller
+        self.git.update_objects(
+            [
+                File(
+                    SIMULATED_CASE_FILE_TEMPLATE.format(case_name),
+                    self._json_encoder_compact(case),
+                ),
+            ],
+        )
+        self._tree_cache.clear()
 
     def push_integration_instances(self, integration_instances: list[dict]) -> None:
         self._push_file(INTEGRATION_INSTANCES_FILE, integration_instances)
@@ -437,7 +552,33 @@ class GitContentManager:
     def push_sla_definitions(self, sla_definitions: list[dict]) -> None:
         self._push_file(SLA_DEFINITIONS_FILE, sla_definitions)
 
-    def _get_file_or_default(self, path, default=None) -> Any:
+    def push_settings_bundle(self, settings: dict[str, Any]) -> None:
+        """Writes several settings files to the repo in one tree update
+
+        Rewriting the tree path once per file is the expensive part of a
+        settings push - bundling them costs a single rewrite for the lot.
+
+        Args:
+            settings: Mapping of logical setting names (keys of
+                SETTINGS_FILES) to their payloads
+
+        """
+        files = [
+            File(SETTINGS_FILES[name], self._json_encoder(content))
+            for name, content in settings.items()
+        ]
+        if files:
+            self.git.update_objects(files)
+            self._tree_cache.clear()
+
+    def _list_files(self, path: str) -> list[File]:
+        if path not in self._tree_cache:
+            self._tree_cache[path] = self.git.get_file_objects_from_path(path)
+        return self._tree_cache[path]
+
+    def _get_file_or_default(self, path: str, default: bytes = None) -> bytes:
+        # Defaults are bytes so callers always see the same type the git
+        # blob read produces
         try:
             return self.git.get_file_contents_from_path(path)
         except KeyError:
@@ -448,10 +589,27 @@ class GitContentManager:
             self.metadata.get_readme_addon(content_type, content_name),
         )
         self.git.update_objects(content.iter_files(), base_path=path)
+        self._tree_cache.clear()
 
     def _push_file(self, path: str, content) -> None:
-        self.git.update_objects([File(path, self._json_encoder(content))])
+        # Encode to bytes once - the same buffer serves the unchanged-blob
+        # check and the File payload, instead of decoding the stored blob
+        # and re-encoding the payload inside File
+        encoded = self._json_encoder(content).encode("utf-8")
+        try:
+            # Unchanged content shouldn't cost a tree rewrite - comparing
+            # against the stored blob is a cheap local read
+            if self.git.get_file_contents_from_path(path) == encoded:
+                return
+        except KeyError:
+            pass
+        self.git.update_objects([File(path, encoded)])
+        self._tree_cache.clear()
 
     @staticmethod
     def _json_encoder(d: dict) -> str:
         return json.dumps(d, indent=4)
+
+    @staticmethod
+    def _json_encoder_compact(d: dict) -> str:
+        return json.dumps(d, separators=(",", ":"))
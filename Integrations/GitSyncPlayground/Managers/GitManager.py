@@ -18,6 +18,9 @@ import json
 import os
 import shutil
 import stat
+import threading
+from collections import defaultdict
+from functools import lru_cache
 from io import StringIO, IOBase
 import sys
 from typing import TYPE_CHECKING, Union, TextIO, Any
@@ -32,10 +35,11 @@ from dulwich.contrib.requests_vendor import RequestsHttpGitClient
 from dulwich.errors import GitProtocolError, HangupException
 from dulwich.object_store import tree_lookup_path
 from dulwich.objects import Blob, Commit, ShaFile, Tree
-from dulwich.refs import HEADREF, LOCAL_BRANCH_PREFIX
-from dulwich.repo import Repo
+from dulwich.refs import HEADREF, LOCAL_BRANCH_PREFIX, _import_remote_refs
+from dulwich.repo import MemoryRepo, Repo
 from paramiko.ssh_exception import SSHException
 import hashlib
+import hmac
 import base64
 import paramiko.ed25519key
 
@@ -45,6 +49,10 @@ from definitions import File, Metadata
 if TYPE_CHECKING:
     from SiemplifyLogger import SiemplifyLogger
 
+# Git entry modes for regular files and directories
+_BLOB_MODE = stat.S_IFREG | 0o644
+_TREE_MODE = stat.S_IFDIR
+
 
 class Git:
     """GitManager"""
@@ -60,6 +68,8 @@ class Git:
         verify_ssl: bool,
         logger: SiemplifyLogger,
         git_server_fingerprint: str,
+        in_memory: bool = False,
+        fetch_all_refs: bool = False,
     ):
         """Wrapper for dulwich - a pure python git client.
 
@@ -74,6 +84,12 @@ class Git:
             verify_ssl (bool): Whether to verify SSL with the git provider
             logger (Logger): A logger instance
             git_server_fingerprint: SSH fingerprint for verification (SHA256:... or MD5:...)
+            in_memory (bool, optional): Keep the whole repository in RAM
+            instead of cloning to the working directory. Every object read
+            and write skips the filesystem; nothing survives the process.
+            Defaults to False.
+            fetch_all_refs (bool, optional): Fetch every advertised ref
+            instead of just the target branch. Defaults to False.
 
         """
         self.logger = logger
@@ -87,6 +103,18 @@ class Git:
         self.author = author.encode("utf-8")
         self.verify_ssl = verify_ssl
         self.git_server_fingerprint = git_server_fingerprint
+        self.in_memory = in_memory
+        self.fetch_all_refs = fetch_all_refs
+
+        # Memoized ref lookups - cleared whenever refs move
+        self._head: Commit | None = None
+        self._branch_tree: Tree | None = None
+        # path -> (mode, sha) index over self.tree, built lazily by
+        # _get_path_trie and dropped whenever the tree is rewritten
+        self._path_trie: dict[bytes, tuple[int, bytes]] | None = None
+
+        # Parsed private key, populated on first use
+        self._pkey: paramiko.PKey | None = None
 
         self.modify_dulwich_client(logger, git_server_fingerprint)
 
@@ -115,10 +143,18 @@ class Git:
             }
 
         # Check if the git repo is present and pull changes. Otherwise, clone the repo.
-        if os.path.isdir(self.wd) and os.path.isdir(os.path.join(self.wd, ".git")):
+        if self.in_memory:
+            self.logger.info(f"Cloning {self.repo_url} into memory")
+            self._clone()
+            # _checkout at the end of the clone just pointed HEAD at the
+            # local branch - no need to walk the refs again
+            head_symref = self.local_branch_ref
+        elif os.path.isdir(self.wd) and os.path.isdir(os.path.join(self.wd, ".git")):
             self.repo = Repo(self.wd)
             config = self.repo.get_config()
-            if config.get_boolean(b"http", b"sslVerify") != self.verify_ssl:
+            # Git defaults sslVerify to true - treat a missing key as true
+            # so a verified setup never rewrites the config on every run
+            if config.get_boolean(b"http", b"sslVerify", True) != self.verify_ssl:
                 self.logger.info("Git Verify SSL parameter changed. Writing new value")
                 config.set(
                     b"http",
@@ -128,18 +164,72 @@ class Git:
                 config.write_to_path()
             self.logger.info("Found existing repo. Pulling Repo Changes")
             self.pull()
+            head_symref = self.repo.refs.get_symrefs()[HEADREF]
         else:
             self.logger.info(f"Couldn't find repo. Cloning from {self.repo_url}")
             self._clone()
+            head_symref = self.local_branch_ref
 
-        if self.local_branch_ref != self.repo.refs.get_symrefs()[HEADREF]:
+        if self.local_branch_ref != head_symref:
             self.logger.info(
                 f"Git branch parameter changed, checking out branch {self.branch_name.decode()}",
             )
             # Branch changed, checking out
             self._checkout()
 
+        # SHA-addressed lookups are immutable, so cached results never go
+        # stale. Only read paths use these - tree-building code must fetch
+        # fresh objects because it mutates them in place. Pack reads share
+        # a seekable file handle, so the store calls are serialized behind
+        # a lock to keep threaded callers (e.g. packing integrations in
+        # parallel) correct.
+        self._store_lock = threading.Lock()
+        self._get_object = lru_cache(maxsize=4096)(
+            self._serialized(self.repo.get_object),
+        )
+        self._get_raw = lru_cache(maxsize=1024)(
+            self._serialized(self.repo.object_store.get_raw),
+        )
+
         self.tree: Tree = self.get_head_tree()
+        # Tree id at the last commit boundary - lets commit_and_push detect
+        # "nothing changed" without materializing the branch tree
+        self._base_tree_id = self.tree.id
+
+    def _serialized(self, func):
+        """Wrap an object-store call so only one thread is inside at a time"""
+
+        def call(sha):
+            with self._store_lock:
+                return func(sha)
+
+        return call
+
+    def _walk_tree_entries(self, tree_id: bytes, include_trees: bool = False) -> list:
+        """Materialize a tree walk in one pass under the store lock
+
+        iter_tree_contents reads pack data lazily while iterating, so a
+        walk must not interleave with other store reads. The entries are
+        collected while holding the lock and consumed lock-free; callers
+        that need blob contents read them afterwards through _get_raw,
+        which takes the lock per object.
+
+        Args:
+            tree_id: SHA of the tree to walk
+            include_trees: Also yield the tree entries themselves
+
+        Returns:
+            A list of the walked tree entries
+
+        """
+        with self._store_lock:
+            return list(
+                dulwich.object_store.iter_tree_contents(
+                    self.repo.object_store,
+                    tree_id,
+                    include_trees=include_trees,
+                ),
+            )
 
     @staticmethod
     def modify_dulwich_client(
@@ -163,30 +253,43 @@ class Git:
 
     @property
     def head(self) -> Commit:
-        """Current repo HEAD commit
+        """Current repo HEAD commit, memoized until refs move
 
         Returns:
             Commit: the HEAD commit object
 
         """
-        # noinspection PyTypeChecker
-        return self.repo.get_object(self.repo.get_refs()[HEADREF])
+        if self._head is None:
+            # noinspection PyTypeChecker
+            self._head = self.repo.get_object(self.repo.get_refs()[HEADREF])
+        return self._head
 
     def get_head_tree(self) -> Tree | ShaFile:
         return self.repo.get_object(self.head.tree)
 
     @property
     def branch_tree(self) -> Tree:
-        """Get the current branch tree.
+        """Get the current branch tree, memoized until refs move.
         Used to diff between self.tree to see if any changes where made.
 
         Returns:
             Tree: Current branch tree
 
         """
-        branch_sha = self.repo.get_refs()[self.local_branch_ref]
-        # noinspection PyTypeChecker
-        return self.repo.get_object(self.repo.get_object(branch_sha).tree)
+        if self._branch_tree is None:
+            branch_sha = self.repo.get_refs()[self.local_branch_ref]
+            # noinspection PyTypeChecker
+            self._branch_tree = self.repo.get_object(
+                self.repo.get_object(branch_sha).tree,
+            )
+        return self._branch_tree
+
+    def _clear_ref_cache(self) -> None:
+        """Forget memoized ref lookups. Must be called after any operation
+        that moves refs (commit, pull, checkout).
+        """
+        self._head = None
+        self._branch_tree = None
 
     def commit_and_push(self, message: str) -> None:
         """Create a commit and push based on current tree
@@ -195,6 +298,9 @@ class Git:
             message (str): Commit message
 
         """
+        if self.tree.id == self._base_tree_id:
+            self.logger.info("No changes found. Nothing to commit.")
+            return
         if self.branch_tree.id != self.tree.id:
             self.logger.info(f"Committing tree {self.tree.id} with message {message}")
             self.repo.do_commit(
@@ -203,6 +309,8 @@ class Git:
                 committer=self.author,
                 author=self.author,
             )
+            self._clear_ref_cache()
+            self._base_tree_id = self.tree.id
             self.push()
         else:
             self.logger.info("No changes found. Nothing to commit.")
@@ -211,9 +319,67 @@ class Git:
         """Pulls changes from the repo. We ignore conflicts and reset local repo to
         the origin one.
         """
-        remote_refs = porcelain.fetch(self.repo, **self.connection_args, depth=1)
-        for key, value in list(remote_refs.items()):
+        remote_refs = self._fetch()
+        for key, value in self._fetched_refs(remote_refs.refs).items():
             self.repo.refs[key] = value
+        self._clear_ref_cache()
+
+    def _fetch(self, determine_wants=None):
+        """Fetch from origin by driving the dulwich client directly.
+
+        porcelain.fetch doesn't forward the client-level knobs
+        (determine_wants, filter_spec), so this mirrors its remote
+        resolution and ref import around a direct client.fetch call.
+        A blob:none partial-clone filter was considered here, but GitSync
+        materializes nearly every blob on each run and dulwich has no
+        promisor machinery to backfill missing ones on demand - the shallow
+        depth=1 fetch is what actually bounds the transfer.
+
+        Args:
+            determine_wants (optional): Callable narrowing which refs to
+            fetch. Defaults to all advertised refs.
+
+        Returns:
+            FetchPackResult: The dulwich fetch result
+
+        """
+        remote_name, remote_location = porcelain.get_remote_repo(self.repo)
+        client, path = _mod_client.get_transport_and_path(
+            remote_location,
+            config=self.repo.get_config_stack(),
+            **self.connection_args,
+        )
+        if determine_wants is None and not self.fetch_all_refs:
+            determine_wants = self._determine_wants
+        result = client.fetch(
+            path,
+            self.repo,
+            determine_wants=determine_wants,
+            depth=1,
+        )
+        if remote_name is not None:
+            _import_remote_refs(
+                self.repo.refs,
+                remote_name,
+                self._fetched_refs(result.refs),
+            )
+        return result
+
+    def _determine_wants(self, refs, depth=None):
+        """Narrow a fetch to the target branch, falling back to remote HEAD"""
+        want = refs.get(LOCAL_BRANCH_PREFIX + self.branch_name) or refs.get(HEADREF)
+        return [want] if want is not None else []
+
+    def _fetched_refs(self, refs: dict[bytes, bytes]) -> dict[bytes, bytes]:
+        """Drop advertised refs whose objects weren't fetched
+
+        A narrowed fetch only downloads the target branch; installing the
+        other advertised refs would leave them dangling.
+        """
+        if self.fetch_all_refs:
+            return refs
+        fetched = set(self._determine_wants(refs))
+        return {key: value for key, value in refs.items() if value in fetched}
 
     def push(self, force_push=False) -> None:
         """Push current branch to the repo
@@ -275,14 +441,14 @@ class Git:
             self.logger.info("Empty repo, creating branch from scratch")
             readme_blob = Blob.from_string(b"# GitSync\n")
             metadata_blob = Blob.from_string(
-                json.dumps(Metadata().__dict__, indent=4).encode(),
+                json.dumps(Metadata().to_json(), indent=4).encode(),
             )
-            self.repo.object_store.add_object(readme_blob)
-            self.repo.object_store.add_object(metadata_blob)
             tree = Tree()
-            tree.add(b"README.md", stat.S_IFREG | 0o644, readme_blob.id)
-            tree.add(b"GitSync.json", stat.S_IFREG | 0o644, metadata_blob.id)
-            self.repo.object_store.add_object(tree)
+            tree.add(b"README.md", _BLOB_MODE, readme_blob.id)
+            tree.add(b"GitSync.json", _BLOB_MODE, metadata_blob.id)
+            self.repo.object_store.add_objects(
+                [(readme_blob, None), (metadata_blob, None), (tree, None)],
+            )
             commit = self.repo.do_commit(
                 b"Initial commit",
                 tree=tree.id,
@@ -299,13 +465,17 @@ class Git:
             None,
             self.repo.refs[self.local_branch_ref],
         )
+        self._clear_ref_cache()
 
     def _clone(self) -> None:
         """Clones a git repository from repo url."""
-        if not os.path.exists(self.wd):
-            os.mkdir(self.wd)
-
-        self.repo = Repo.init(self.wd)
+        if self.in_memory:
+            # All objects, refs and config live in RAM - no .git directory
+            self.repo = MemoryRepo()
+        else:
+            if not os.path.exists(self.wd):
+                os.mkdir(self.wd)
+            self.repo = Repo.init(self.wd)
         try:
             config = self.repo.get_config()
             config.set((b"remote", b"origin"), b"url", self.repo_url.encode("utf-8"))
@@ -315,9 +485,10 @@ class Git:
                 b"+refs/heads/*:refs/remotes/origin/*",
             )
             config.set(b"http", b"sslVerify", b"true" if self.verify_ssl else b"false")
-            config.write_to_path()
+            if not self.in_memory:
+                config.write_to_path()
 
-            fetch_results = porcelain.fetch(self.repo, **self.connection_args, depth=1)
+            fetch_results = self._fetch()
 
             origin_head_ref = fetch_results.symrefs.get(HEADREF)
             origin_head_sha = fetch_results.refs.get(HEADREF)
@@ -339,8 +510,9 @@ class Git:
             self._checkout()
 
         except BaseException:
-            shutil.rmtree(self.wd)
-            self.repo.close()
+            if not self.in_memory:
+                shutil.rmtree(self.wd)
+                self.repo.close()
             raise
 
     def update_objects(self, files: list[File], base_path: str | bytes = b"") -> Tree:
@@ -362,11 +534,11 @@ class Git:
             base_path = base_path.encode("utf-8")
         self.tree = self._modify_tree(files, self.tree, base_path)
         self.repo.object_store.add_object(self.tree)
+        self._path_trie = None
         return self.tree
 
     def _modify_tree(self, files: list[File], tree: Tree, base_path=b"") -> Tree:
-        """Modifies a given tree, recursively, and adds all objects to the
-        repo.object_store
+        """Modifies a given tree and adds all objects to the repo.object_store
 
         Args:
             files (list[File]): A list or generator of File objects
@@ -379,31 +551,34 @@ class Git:
             Tree: The modified tree
 
         """
-        try:
-            _, subtree = tree.lookup_path(
-                lambda sha: self.repo[sha],
-                base_path.split(b"/")[0],
-            )
-            subtree = self.repo[subtree]
-        except KeyError:
-            subtree = Tree()
-
         if not base_path:
             new_tree = self._create_raw_tree(files, tree)
             self.repo.object_store.add_object(new_tree)
             return new_tree
 
-        base_path = base_path.split(b"/")
-        folder_name = base_path.pop(0)
-        base_path = b"/".join(base_path)
-        if not base_path:
-            # New Directory
-            new_tree = self._create_raw_tree(files)
-        else:
-            new_tree = self._modify_tree(files, subtree, base_path)
+        # Walk down to the parent of the leaf directory once, keeping the
+        # trees along the way so they can be relinked bottom-up afterwards
+        path_items = base_path.split(b"/")
+        stack = [tree]
+        current = tree
+        for name in path_items[:-1]:
+            try:
+                _, sha = current[name]
+                current = self.repo[sha]
+            except KeyError:
+                current = Tree()
+            stack.append(current)
+
+        # The leaf directory is fully replaced by the new files
+        new_tree = self._create_raw_tree(files)
         self.repo.object_store.add_object(new_tree)
-        tree.add(folder_name, stat.S_IFDIR, new_tree.id)
-        return tree
+        for i in range(len(path_items) - 1, -1, -1):
+            parent = stack[i]
+            parent[path_items[i]] = (_TREE_MODE, new_tree.id)
+            if i:
+                self.repo.object_store.add_object(parent)
+            new_tree = parent
+        return new_tree
 
     def _create_raw_tree(self, files: list[File], tree: Tree = None) -> Tree:
         """It is recommended to use the function update_objects.
@@ -422,32 +597,59 @@ class Git:
         """
         if not tree:
             tree = Tree()
+
+        # Group files by their directory so every touched tree is rebuilt
+        # and serialized exactly once, instead of once per file
+        files_by_dir: dict[tuple[bytes, ...], list[tuple[bytes, File]]] = defaultdict(
+            list,
+        )
         for file in files:
-            mode = stat.S_IFREG | 0o644
-            obj = Blob()
-            obj.data = file.content
             path_items = file.path.encode("utf-8").split(b"/")
-            sub_tree = tree
-            old_trees = [sub_tree]
-            for name in path_items[:-1]:
-                try:
-                    _, sub_tree_sha = sub_tree[name]
-                except KeyError:
-                    sub_tree = Tree()
-                else:
-                    sub_tree = self.repo.get_object(sub_tree_sha)
-                old_trees.append(sub_tree)
-
-            for old_tree, name in reversed(
-                tuple(zip(old_trees, path_items, strict=False)),
-            ):
-                old_tree[name] = (mode, obj.id)
-                self.repo.object_store.add_object(obj)
-                obj = old_tree
-                mode = stat.S_IFDIR
-
-            self.repo.object_store.add_object(obj)
-            tree = obj
+            files_by_dir[tuple(path_items[:-1])].append((path_items[-1], file))
+
+        # Every ancestor directory takes part in the rebuild
+        dirs = set(files_by_dir)
+        for directory in tuple(dirs):
+            for depth in range(len(directory)):
+                dirs.add(directory[:depth])
+        dirs.add(())
+
+        # Load the existing trees top-down, creating empty ones as needed
+        trees: dict[tuple[bytes, ...], Tree] = {(): tree}
+        for directory in sorted(dirs, key=len):
+            if not directory:
+                continue
+            try:
+                mode, subtree_sha = trees[directory[:-1]][directory[-1]]
+            except KeyError:
+                subtree = Tree()
+            else:
+                subtree = (
+                    self.repo.get_object(subtree_sha)
+                    if stat.S_ISDIR(mode)
+                    else Tree()
+                )
+            trees[directory] = subtree
+
+        # Attach the blobs to their trees
+        new_objects: list[tuple[ShaFile, None]] = []
+        for directory, entries in files_by_dir.items():
+            sub_tree = trees[directory]
+            for name, file in entries:
+                blob = Blob()
+                blob.data = file.content
+                new_objects.append((blob, None))
+                sub_tree[name] = (_BLOB_MODE, blob.id)
+
+        # Serialize bottom-up so every parent links its final child id
+        for directory in sorted(dirs, key=len, reverse=True):
+            sub_tree = trees[directory]
+            new_objects.append((sub_tree, None))
+            if directory:
+                trees[directory[:-1]][directory[-1]] = (_TREE_MODE, sub_tree.id)
+
+        # One batched write instead of a loose-object file per blob/tree
+        self.repo.object_store.add_objects(new_objects)
 
         return tree
 
@@ -472,15 +674,35 @@ class Git:
         """
         if isinstance(path, str):
             path = path.encode("utf-8")
-        if tree is None:
-            tree = self.tree
+        if tree is None or tree is self.tree:
+            # Lookups against the current tree go through the path index -
+            # one tree walk serves every subsequent path resolution
+            try:
+                _, sha = self._get_path_trie()[path]
+            except KeyError as e:
+                raise KeyError(f"Couldn't find folder or file: {e}")
+            return self._get_object(sha)
         try:
-            return self.repo.get_object(
-                tree_lookup_path(self.repo.get_object, tree.id, path)[1],
+            return self._get_object(
+                tree_lookup_path(self._get_object, tree.id, path)[1],
             )
         except KeyError as e:
             raise KeyError(f"Couldn't find folder or file: {e}")
 
+    def _get_path_trie(self) -> dict[bytes, tuple[int, bytes]]:
+        """Index of every path in the current tree to its (mode, sha)
+
+        Built with a single recursive walk instead of re-reading the
+        intermediate trees once per lookup. update_objects drops it when the
+        tree is rewritten.
+        """
+        if self._path_trie is None:
+            self._path_trie = {
+                entry.path: (entry.mode, entry.sha)
+                for entry in self._walk_tree_entries(self.tree.id, include_trees=True)
+            }
+        return self._path_trie
+
     def get_file_objects_from_path(self, path: str, tree: Tree = None) -> list[File]:
         """Get a list of File objects from a path
 
@@ -492,22 +714,58 @@ class Git:
         Returns:
             list[Files]: All files inside the given path
 
+        """
+        base = self.get_raw_object_from_path(path, tree)
+        return [
+            File(entry.path.decode("utf-8"), self._get_raw(entry.sha)[1])
+            for entry in self._walk_tree_entries(base.id)
+            if entry.mode == _BLOB_MODE
+        ]
+
+    def iter_file_objects_from_path(self, path: str, tree: Tree = None):
+        """Yield File objects from a path one at a time
+
+        Blob contents are read lazily, so only the file currently being
+        consumed is held in memory - use this over
+        get_file_objects_from_path when the files can be large.
+
+        Args:
+            path: Path to get File from
+            tree (Tree, optional): Base tree to look for files. If not passed will
+            use HEAD tree. Defaults to None.
+
+        Yields:
+            File: The next file inside the given path
+
         """
         tree = self.get_raw_object_from_path(path, tree)
-        files = []
-        for file in dulwich.object_store.iter_tree_contents(
-            self.repo.object_store,
-            tree.id,
-            include_trees=True,
-        ):
-            if file.mode == stat.S_IFREG | 0o644:
-                files.append(
-                    File(
-                        file.path.decode("utf-8"),
-                        self.repo.object_store.get_raw(file.sha)[1],
-                    ),
+        for file in self._walk_tree_entries(tree.id):
+            if file.mode == _BLOB_MODE:
+                # Contents load lazily on first access so skipped files
+                # never touch the object store
+                yield File(
+                    file.path.decode("utf-8"),
+                    lambda sha=file.sha: self._get_raw(sha)[1],
                 )
-        return files
+
+    def get_file_paths_from_path(self, path: str, tree: Tree = None) -> list[str]:
+        """Get the paths of all files under a path without reading blob contents
+
+        Args:
+            path: Path to list files under
+            tree (Tree, optional): Base tree to look for files. If not passed will
+            use HEAD tree. Defaults to None.
+
+        Returns:
+            list[str]: Paths of all files inside the given path, relative to it
+
+        """
+        tree = self.get_raw_object_from_path(path, tree)
+        return [
+            file.path.decode("utf-8")
+            for file in self._walk_tree_entries(tree.id, include_trees=True)
+            if file.mode == _BLOB_MODE
+        ]
 
     def get_file_contents_from_path(self, path: str, tree: Tree = None) -> bytes:
         """Get a specific file contents from a path
@@ -516,7 +774,7 @@ class Git:
             bytes: File contents
 
         """
-        return self.repo.object_store.get_raw(
+        return self._get_raw(
             self.get_raw_object_from_path(path, tree).id,
         )[1]
 
@@ -531,33 +789,63 @@ class Git:
             Paramiko Key: Private key object
 
         """
-        self.password = base64.b64decode(self.password).decode("utf-8")
-        try:
-            return paramiko.rsakey.RSAKey.from_private_key(StringIO(self.password))
-        except SSHException:
+        if self._pkey is not None:
+            return self._pkey
+
+        key_data = base64.b64decode(self.password).decode("utf-8")
+        loaders = [
+            paramiko.rsakey.RSAKey.from_private_key,
+            paramiko.ed25519key.Ed25519Key.from_private_key,
+        ]
+        if "OPENSSH PRIVATE KEY" in key_data.partition("\n")[0]:
+            # OpenSSH format keys are usually Ed25519 - try that first to
+            # avoid a guaranteed-to-fail RSA parse
+            loaders.reverse()
+
+        last_error = None
+        for loader in loaders:
             try:
-                return paramiko.ed25519key.Ed25519Key.from_private_key(
-                    StringIO(self.password),
-                )
+                self._pkey = loader(StringIO(key_data))
+                return self._pkey
             except SSHException as e:
-                raise Exception(e)
+                last_error = e
+        raise Exception(last_error)
 
     def list_files(self) -> None:
         """Prints list of files in the repo, recursive."""
-        for file in dulwich.object_store.iter_tree_contents(
-            self.repo.object_store,
-            self.tree.id,
-        ):
+        for file in self._walk_tree_entries(self.tree.id):
             self.logger.info(file)
 
     def cleanup(self) -> None:
-        """Close Dulwich repository to release file handles."""
+        """Close Dulwich repository and pooled SSH connections to release
+        file handles.
+        """
+        close_pooled_ssh_clients()
         try:
-            self.repo.close()
+            # MemoryRepo holds no file handles and has no close()
+            getattr(self.repo, "close", lambda: None)()
         except Exception as e:
             self.logger.warn(f"Git cleanup failed: {e}", exc_info=True)
 
 
+# Authenticated SSH transports keyed by connection identity. dulwich runs
+# each git command on its own channel, so one transport can serve every
+# fetch/push in a run without paying the TCP+SSH handshake per operation.
+_SSH_CLIENT_POOL: dict[tuple, paramiko.SSHClient] = {}
+_SSH_POOL_LOCK = threading.Lock()
+
+
+def close_pooled_ssh_clients() -> None:
+    """Close and drop every pooled SSH connection."""
+    with _SSH_POOL_LOCK:
+        for client in _SSH_CLIENT_POOL.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _SSH_CLIENT_POOL.clear()
+
+
 class SiemplifyParamikoSSHVendor:
     def __init__(
         self, siemplify_logger: SiemplifyLogger, git_server_fingerprint: str, **kwargs: Any
@@ -567,6 +855,17 @@ class SiemplifyParamikoSSHVendor:
         self.git_server_fingerprint = (
             git_server_fingerprint.strip() if git_server_fingerprint else None
         )
+        # Parse the expected fingerprint once - verification per key is
+        # then just hash, format and compare
+        self._fp_alg = None
+        self._fp_expected = None
+        if self.git_server_fingerprint:
+            if self.git_server_fingerprint.startswith("SHA256:"):
+                self._fp_alg = "sha256"
+                self._fp_expected = self.git_server_fingerprint[len("SHA256:") :]
+            elif self.git_server_fingerprint.startswith("MD5:"):
+                self._fp_alg = "md5"
+                self._fp_expected = self.git_server_fingerprint[len("MD5:") :].lower()
 
         self.siemplify_logger = siemplify_logger
 
@@ -575,25 +874,24 @@ class SiemplifyParamikoSSHVendor:
         if not self.git_server_fingerprint:
             return False
 
-        fingerprint = self.git_server_fingerprint.strip()
-        self.siemplify_logger.info(f"Verifying fingerprint: {fingerprint}")
+        self.siemplify_logger.info(
+            f"Verifying fingerprint: {self.git_server_fingerprint}",
+        )
+        if self._fp_alg is None:
+            self.siemplify_logger.error(
+                f"Unsupported fingerprint format: {self.git_server_fingerprint}",
+            )
+            return False
 
         try:
-            if fingerprint.startswith("SHA256:"):
-                expected_fingerprint = fingerprint.replace("SHA256:", "")
-                key_hash = hashlib.sha256(received_key.asbytes()).digest()
-                actual_fingerprint = base64.b64encode(key_hash).decode("ascii").rstrip("=")
+            key_hash = hashlib.new(self._fp_alg, received_key.asbytes()).digest()
+            if self._fp_alg == "sha256":
+                actual_fingerprint = base64.b64encode(key_hash).rstrip(b"=").decode("ascii")
                 self.siemplify_logger.info(f"Actual SHA256 fingerprint: {actual_fingerprint}")
-                return actual_fingerprint == expected_fingerprint
-            elif fingerprint.startswith("MD5:"):
-                expected_fingerprint = fingerprint.replace("MD5:", "").lower()
-                key_hash = hashlib.md5(received_key.asbytes()).digest()
-                actual_fingerprint = ":".join(f"{b:02x}" for b in key_hash)
-                self.siemplify_logger.info(f"Actual MD5 fingerprint: {actual_fingerprint}")
-                return actual_fingerprint == expected_fingerprint
             else:
-                self.siemplify_logger.error(f"Unsupported fingerprint format: {fingerprint}")
-                return False
+                actual_fingerprint = key_hash.hex(":")
+                self.siemplify_logger.info(f"Actual MD5 fingerprint: {actual_fingerprint}")
+            return hmac.compare_digest(actual_fingerprint, self._fp_expected)
         except Exception as e:
             self.siemplify_logger.exception(e)
             self.siemplify_logger.error(
@@ -612,8 +910,6 @@ class SiemplifyParamikoSSHVendor:
         protocol_version=None,
         **kwargs,
     ):
-        client = paramiko.SSHClient()
-
         connection_kwargs = {"hostname": host}
         connection_kwargs.update(self.kwargs)
         if username:
@@ -627,6 +923,58 @@ class SiemplifyParamikoSSHVendor:
 
         connection_kwargs.update(kwargs)
 
+        pkey = connection_kwargs.get("pkey")
+        pool_key = (
+            host,
+            port,
+            username,
+            pkey.get_fingerprint() if pkey is not None else None,
+            key_filename,
+        )
+
+        client = self._get_pooled_client(pool_key)
+        if client is None:
+            client = self._connect(connection_kwargs)
+            with _SSH_POOL_LOCK:
+                _SSH_CLIENT_POOL[pool_key] = client
+
+        try:
+            channel = client.get_transport().open_session()
+        except (SSHException, EOFError, OSError):
+            # Pooled transport went stale mid-flight - reconnect once
+            self.siemplify_logger.info("SSH connection went stale, reconnecting")
+            with _SSH_POOL_LOCK:
+                _SSH_CLIENT_POOL.pop(pool_key, None)
+            client = self._connect(connection_kwargs)
+            with _SSH_POOL_LOCK:
+                _SSH_CLIENT_POOL[pool_key] = client
+            channel = client.get_transport().open_session()
+
+        if protocol_version is None or protocol_version == 2:
+            channel.set_environment_variable(name="GIT_PROTOCOL", value="version=2")
+
+        self.siemplify_logger.error(f"Successfully connected to {host}")
+
+        channel.exec_command(command)
+
+        return _ParamikoWrapper(client, channel)
+
+    @staticmethod
+    def _get_pooled_client(pool_key: tuple) -> paramiko.SSHClient | None:
+        """Return a pooled client with a live transport, or None."""
+        with _SSH_POOL_LOCK:
+            client = _SSH_CLIENT_POOL.get(pool_key)
+            if client is not None:
+                transport = client.get_transport()
+                if transport is not None and transport.is_active():
+                    return client
+                _SSH_CLIENT_POOL.pop(pool_key, None)
+        return None
+
+    def _connect(self, connection_kwargs: dict) -> paramiko.SSHClient:
+        """Open and authenticate a fresh SSH connection."""
+        client = paramiko.SSHClient()
+
         # Handle host key verification based on whether git_server_fingerprint is provided
         if self.git_server_fingerprint:
             client.get_host_keys().clear()  # FORCE unknown host behavior
@@ -639,16 +987,7 @@ class SiemplifyParamikoSSHVendor:
             client.set_missing_host_key_policy(paramiko.client.AutoAddPolicy())
 
         client.connect(**connection_kwargs)
-        channel = client.get_transport().open_session()
-
-        if protocol_version is None or protocol_version == 2:
-            channel.set_environment_variable(name="GIT_PROTOCOL", value="version=2")
-
-        self.siemplify_logger.error(f"Successfully connected to {host}")
-
-        channel.exec_command(command)
-
-        return _ParamikoWrapper(client, channel)
+        return client
 
 
 def remote_error_from_stderr(stderr):
@@ -674,6 +1013,9 @@ class TeeStream(IOBase):
     def __init__(self, *streams: Union[TextIO, IOBase]) -> None:
         super().__init__()
         self._streams = tuple(streams)
+        # Bound write methods resolved once - the write hot path only
+        # loops over these instead of re-dispatching per call
+        self._writers = tuple(s.write for s in self._streams if hasattr(s, "write"))
         self._closed = False
         # Protect standard streams from closure
         self._protected_streams = frozenset({sys.stdout, sys.stderr, sys.stdin})
@@ -688,10 +1030,13 @@ class TeeStream(IOBase):
         if self._closed:
             raise ValueError("I/O operation on closed stream")
 
-        content = self._normalize_content(data)
+        content = data if type(data) is str else self._normalize_content(data)
 
-        for stream in self._streams:
-            self._safe_write(stream, content)
+        for writer in self._writers:
+            try:
+                writer(content)
+            except Exception:
+                pass
 
         return len(content)
 
@@ -740,15 +1085,6 @@ class TeeStream(IOBase):
             return data.decode("utf-8", errors="replace")
         return str(data)
 
-    @staticmethod
-    def _safe_write(stream: Union[TextIO, IOBase], content: str) -> None:
-        """Write to stream with error suppression."""
-        if not getattr(stream, "closed", False):
-            try:
-                stream.write(content)
-            except Exception:
-                pass
-
     @staticmethod
     def _safe_flush(stream: Union[TextIO, IOBase]) -> None:
         """Flush stream with error suppression."""
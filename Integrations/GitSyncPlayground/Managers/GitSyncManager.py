@@ -14,16 +14,21 @@
 
 from __future__ import annotations
 
+import os
 import re
 import tempfile
+import threading
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from operator import methodcaller
 from typing import TYPE_CHECKING, Any
 from TIPCommon.types import SingleJson
 from TIPCommon.rest.soar_api import install_integration
 
 from jinja2 import Template
 
-from cache import Cache, Context, get_context_factory
+from cache import Cache, Context, DiskCache, get_context_factory
 from constants import (
     ALL_ENVIRONMENTS_IDENTIFIER,
     COMMIT_AUTHOR_REGEX,
@@ -47,6 +52,16 @@ if TYPE_CHECKING:
     from TIPCommon.types import ChronicleSOAR
 
 
+_COMMIT_AUTHOR_RE = re.compile(COMMIT_AUTHOR_REGEX)
+# Compiled once - Jinja parsing and codegen are not cheap per render
+_ROOT_README_TEMPLATE = Template(ROOT_README)
+
+
+def _strip_new_lines(s: str) -> str:
+    """Collapse a description to one line; descriptions might be None"""
+    return s.replace("\n", "").strip() if s else s
+
+
 class MergeConflictError(Exception):
     """A merge conflict was discovered."""
 
@@ -77,6 +92,8 @@ class GitSyncManager:
         smp_verify: bool = True,
         git_verify: bool = True,
         git_server_fingerprint: str = "",
+        git_fetch_all_refs: bool = False,
+        use_disk_cache: bool = False,
     ):
         self.logger = siemplify.LOGGER
         self._siemplify = siemplify
@@ -90,6 +107,7 @@ class GitSyncManager:
             smp_verify,
         )
         self.git_server_fingerprint = git_server_fingerprint
+        self.use_disk_cache = use_disk_cache
         self.git_client = Git(
             repo_url,
             branch,
@@ -100,6 +118,7 @@ class GitSyncManager:
             git_verify,
             self.logger,
             git_server_fingerprint=git_server_fingerprint,
+            fetch_all_refs=git_fetch_all_refs,
         )
         self.content = GitContentManager(self.git_client, self.api)
 
@@ -166,7 +185,7 @@ class GitSyncManager:
                 default_value=DEFAULT_AUTHOR,
             )
 
-        if not re.fullmatch(COMMIT_AUTHOR_REGEX, git_author):
+        if not _COMMIT_AUTHOR_RE.fullmatch(git_author):
             raise Exception(
                 "Commit Author parameter must be in the following format: Name <example@gmail.com>",
             )
@@ -213,6 +232,12 @@ class GitSyncManager:
         """
         if integration.identifier in IGNORED_INTEGRATIONS:
             return
+        content_hash = integration.content_hash
+        if content_hash == self.content.metadata.get_content_hash(integration.identifier):
+            self.logger.info(
+                f"{integration.identifier} is unchanged since the last install - skipping",
+            )
+            return
         self.logger.info(f"Installing {integration.identifier}")
         if integration.isCustom:
             self.logger.info(
@@ -236,18 +261,13 @@ class GitSyncManager:
                         "from the marketplace",
                     )
                     return
-            integration_cards = next(
-                x for x in self.api.get_ide_cards() if x["identifier"] == integration.identifier
-            )["cards"]
+            integration_cards = self._ide_cards_by_identifier.get(
+                integration.identifier,
+                {},
+            ).get("cards", [])
+            card_index = {(x["name"], x["type"]): x for x in integration_cards}
             for script in integration.get_all_items():
-                item_card = next(
-                    (
-                        x
-                        for x in integration_cards
-                        if x["name"] == script["name"] and x["type"] == script["type"]
-                    ),
-                    None,
-                )
+                item_card = card_index.get((script["name"], script["type"]))
                 if item_card:
                     script["id"] = item_card["id"]
                     self.logger.info(
@@ -262,6 +282,10 @@ class GitSyncManager:
                     ScriptType(script.get("type")),
                 )
                 self.api.update_ide_item(script)
+        # Installing changes the available cards - let the index rebuild
+        self.refresh_cache_item("ide_cards")
+        # Remember what was installed; persisted with the next metadata push
+        self.content.metadata.set_content_hash(integration.identifier, content_hash)
 
     def install_connector(self, connector: Connector) -> None:
         """Installs or update a connector instance
@@ -284,7 +308,12 @@ class GitSyncManager:
             )
             # Integration is not installed - try installing from repo,
             # and if not install from the marketplace
-            integration = self.content.get_integration(connector.integration)
+            # compress - a custom integration found in the repo is uploaded
+            # to the platform as base64
+            integration = self.content.get_integration(
+                connector.integration,
+                compress=True,
+            )
             if integration and integration.isCustom:
                 self.logger.info("Custom integration found in repo, installing")
                 # Integration found in repo
@@ -307,7 +336,7 @@ class GitSyncManager:
                 "Please upgrade the connector.",
             )
             connector.raw_data["isUpdateAvailable"] = True
-        if connector.environment not in self.api.get_environment_names(self._siemplify):
+        if connector.environment not in self._environment_names:
             self.logger.warn(
                 f"Connector is set to non-existing environment {connector.environment}. "
                 f"Using Default Environment instead",
@@ -322,9 +351,17 @@ class GitSyncManager:
 
         """
         self.logger.info(f"Installing mappings for {mappings.integrationName}")
+        rule_payloads = []
         for rule in mappings.rules:
-            self.api.add_mapping_rules(rule["familyFields"])
-            self.api.add_mapping_rules(rule["systemFields"])
+            rule_payloads.append(rule["familyFields"])
+            rule_payloads.append(rule["systemFields"])
+        if len(rule_payloads) < 4:
+            for payload in rule_payloads:
+                self.api.add_mapping_rules(payload)
+        else:
+            # The rule posts are independent - overlap their round-trips
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(self.api.add_mapping_rules, rule_payloads))
 
         for record in mappings.records:
             self.api.set_mappings_visual_family(
@@ -346,9 +383,9 @@ class GitSyncManager:
         """
         # Validate all playbook environments exist as environments or environment groups
         environments = (
-            self.api.get_environment_names(self._siemplify)
-            + self.api.get_environment_group_names()
-            + [ALL_ENVIRONMENTS_IDENTIFIER]
+            set(self._environment_names)
+            | set(self.api.get_environment_group_names())
+            | {ALL_ENVIRONMENTS_IDENTIFIER}
         )
         for p in workflows:
             if not all(x in environments for x in p.environments):
@@ -357,11 +394,18 @@ class GitSyncManager:
                     f"{p.environments[0]}",
                 )
 
-        # Remove duplicates and split by type
-        workflows = list(set(workflows))
+        # Remove duplicates and split by type, keeping the original order
+        workflows = list(dict.fromkeys(workflows))
         siemplify_context: Context = get_context_factory(self._siemplify)
         cache: Cache[str, int] = Cache(siemplify_context)
-        playbook_installer = WorkflowInstaller(self._siemplify, self.api, self.logger, cache)
+        playbook_installer = WorkflowInstaller(
+            self._siemplify,
+            self.api,
+            self.logger,
+            cache,
+            use_disk_cache=self.use_disk_cache,
+        )
+        playbook_installer.prime_context_filter({w.name for w in workflows})
         blocks, playbooks = [], []
         for workflow in workflows:
             if workflow.type == WorkflowTypes.BLOCK:
@@ -370,14 +414,28 @@ class GitSyncManager:
             else:
                 playbooks.append(workflow)
 
-        # Save blocks first
+        # Save blocks first. Context flushes are deferred to a single
+        # push once the whole batch is done.
         for block in blocks:
-            playbook_installer.install_workflow(block)
+            playbook_installer.install_workflow(block, flush=False)
 
         playbook_installer.refresh_cache_item("playbooks")
 
-        for playbook in playbooks:
-            playbook_installer.install_workflow(playbook)
+        # Playbooks are independent once the blocks are in - overlap the
+        # per-playbook REST round-trips
+        if len(playbooks) < 2:
+            for playbook in playbooks:
+                playbook_installer.install_workflow(playbook, flush=False)
+        else:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(
+                    executor.map(
+                        lambda p: playbook_installer.install_workflow(p, flush=False),
+                        playbooks,
+                    ),
+                )
+
+        playbook_installer.flush_context()
 
     def install_job(self, job: Job) -> None:
         """Installs or updates a job instance
@@ -393,10 +451,10 @@ class GitSyncManager:
             )
             return
         # Try to find and fix the jobDefinitionId field
-        integration_cards = next(
-            (x for x in self.api.get_ide_cards() if x["identifier"] == job.integration),
-            {},
-        ).get("cards", None)
+        integration_cards = self._ide_cards_by_identifier.get(job.integration, {}).get(
+            "cards",
+            None,
+        )
         if integration_cards:
             job_def_id = next(
                 (x for x in integration_cards if x["type"] == 2 and x["name"] == job.name),
@@ -405,14 +463,7 @@ class GitSyncManager:
             if job_def_id:
                 job.raw_data["jobDefinitionId"] = job_def_id.get("id")
 
-        job_id = next(
-            (
-                x
-                for x in self.api.get_jobs(chronicle_soar=self._siemplify)
-                if x.get("displayName", x.get("name")) == job.name
-            ),
-            None,
-        )
+        job_id = self._jobs_by_name.get(job.name)
         if job_id:
             job.raw_data["id"] = job_id.get("id")
         self.api.add_job(job.raw_data)
@@ -425,47 +476,59 @@ class GitSyncManager:
         Returns: Readme file contents
         """
 
-        def strip_new_lines(s: str):
-            # Description might be None
-            return s.replace("\n", "").strip() if s else s
+        # The content walks are independent and I/O-bound - run them together
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            integrations_future = executor.submit(
+                lambda: list(self.content.get_integrations()),
+            )
+            playbooks_future = executor.submit(lambda: list(self.content.get_playbooks()))
+            connectors_future = executor.submit(lambda: list(self.content.get_connectors()))
+            jobs_future = executor.submit(lambda: list(self.content.get_jobs()))
+            visual_families_future = executor.submit(
+                lambda: list(self.content.get_visual_families()),
+            )
+            mapped_integrations_future = executor.submit(
+                lambda: {m.integrationName for m in self.content.get_mappings()},
+            )
 
         integrations = [
             {
                 "name": integration.definition["DisplayName"],
-                "description": strip_new_lines(integration.definition["Description"]),
+                "description": _strip_new_lines(integration.definition["Description"]),
             }
-            for integration in self.content.get_integrations()
+            for integration in integrations_future.result()
         ]
 
         playbooks = [
             {
                 "name": playbook.name,
-                "description": strip_new_lines(playbook.description),
+                "description": _strip_new_lines(playbook.description),
             }
-            for playbook in self.content.get_playbooks()
+            for playbook in playbooks_future.result()
         ]
 
+        # One pass over the mappings folder replaces a repo lookup per connector
+        mapped_integrations = mapped_integrations_future.result()
         connectors = [
             {
                 "name": connector.name,
-                "description": strip_new_lines(connector.description),
-                "hasMappings": (True if self.content.get_mapping(connector.integration) else False),
+                "description": _strip_new_lines(connector.description),
+                "hasMappings": connector.integration in mapped_integrations,
             }
-            for connector in self.content.get_connectors()
+            for connector in connectors_future.result()
         ]
 
         jobs = [
-            {"name": job.name, "description": strip_new_lines(job.description)}
-            for job in self.content.get_jobs()
+            {"name": job.name, "description": _strip_new_lines(job.description)}
+            for job in jobs_future.result()
         ]
 
         visual_families = [
-            {"name": vf.name, "description": strip_new_lines(vf.description)}
-            for vf in self.content.get_visual_families()
+            {"name": vf.name, "description": _strip_new_lines(vf.description)}
+            for vf in visual_families_future.result()
         ]
 
-        readme = Template(ROOT_README)
-        return readme.render(
+        return _ROOT_README_TEMPLATE.render(
             connectors=connectors,
             integrations=integrations,
             jobs=jobs,
@@ -511,12 +574,50 @@ class GitSyncManager:
             self._cache["marketplace"] = self.api.get_store_data()
         return self._cache.get("marketplace")
 
+    @property
+    def _environment_names(self) -> list[str]:
+        """Configured environment names, fetched once per run"""
+        if "env_names" not in self._cache:
+            self._cache["env_names"] = self.api.get_environment_names(self._siemplify)
+        return self._cache.get("env_names")
+
+    @property
+    def _jobs_by_name(self) -> dict[str, dict]:
+        """Installed jobs indexed by display name"""
+        if "jobs" not in self._cache:
+            self._cache["jobs"] = {
+                x.get("displayName", x.get("name")): x
+                for x in self.api.get_jobs(chronicle_soar=self._siemplify)
+            }
+        return self._cache.get("jobs")
+
+    @property
+    def _ide_cards_by_identifier(self) -> dict[str, dict]:
+        """IDE cards indexed by integration identifier"""
+        if "ide_cards" not in self._cache:
+            self._cache["ide_cards"] = {
+                x["identifier"]: x for x in self.api.get_ide_cards()
+            }
+        return self._cache.get("ide_cards")
+
+    @property
+    def _marketplace_by_id(self) -> dict[str, dict]:
+        """Marketplace integrations indexed by identifier"""
+        if "marketplace_by_id" not in self._cache:
+            self._cache["marketplace_by_id"] = {
+                x["identifier"]: x for x in self._marketplace_integrations
+            }
+        return self._cache.get("marketplace_by_id")
+
     def clear_cache(self) -> None:
         self._cache = {}
 
     def refresh_cache_item(self, item_name) -> None:
         if item_name in self._cache:
             del self._cache[item_name]
+        if item_name == "marketplace":
+            # The by-id index is derived from the marketplace list
+            self._cache.pop("marketplace_by_id", None)
 
     def install_marketplace_integration(self, integration_name: str) -> bool:
         """Installs or update an integration from the marketplace.
@@ -527,10 +628,7 @@ class GitSyncManager:
         Returns: True if the integration was installed successfully, otherwise False
 
         """
-        store_integration = next(
-            (x for x in self._marketplace_integrations if x["identifier"] == integration_name),
-            None,
-        )
+        store_integration = self._marketplace_by_id.get(integration_name)
         if not store_integration:
             self.logger.warn(
                 f"Integration {integration_name} wasn't found in the marketplace",
@@ -545,6 +643,13 @@ class GitSyncManager:
                 is_certified=store_integration["isCertified"],
             )
             self.logger.info(f"{integration_name} installed successfully")
+            # TIPCommon's installer bypasses the API client, so the cached
+            # card, store and marketplace reads are stale now - drop them
+            # before anyone indexes the just-installed integration
+            self.refresh_cache_item("ide_cards")
+            self.refresh_cache_item("marketplace")
+            self.api.refresh_cache_item("ide_cards")
+            self.api.refresh_cache_item("store_data")
             return True
         except Exception as e:
             self.logger.warn(f"Couldn't install {integration_name} - {e}")
@@ -561,16 +666,19 @@ class GitSyncManager:
         Returns: Integration version
 
         """
-        return next(
-            (
-                x["installedVersion"]
-                for x in self._marketplace_integrations
-                if x["identifier"] == integration_name
-            ),
+        return self._marketplace_by_id.get(integration_name, {}).get(
+            "installedVersion",
             0.0,
         )
 
 
+# Sentinel key caching a {name: parameter} index on a step dict. Stripped
+# before the step is sent back to the platform.
+_PARAM_INDEX_KEY = "_param_index"
+# UUIDs preallocated per urandom draw when defining new workflows
+_UUID_POOL_SIZE = 32
+
+
 class WorkflowInstaller:
     """Helper class for installing workflows"""
 
@@ -580,38 +688,74 @@ class WorkflowInstaller:
         api: SiemplifyApiClient,
         logger: SiemplifyLogger,
         mod_time_cache: Cache[str, int],
+        use_disk_cache: bool = False,
     ) -> None:
         self.chronicle_soar = chronicle_soar
         self.api: SiemplifyApiClient = api
         self.logger: SiemplifyLogger = logger
         self._mod_time_cache: Cache[str, int] = mod_time_cache
         self._cache: dict[str, Any] = {}
+        # Names the mod-time cache may keep, precomputed for batch installs
+        self._filter_names: frozenset[str] | None = None
+        # Guards the mod-time cache and category creation when installs
+        # run on a thread pool
+        self._state_lock = threading.Lock()
+        self._uuid_pool: deque[str] = deque()
+        # Optional cross-run cache for slow-changing API reads (categories,
+        # instance lists), keyed by platform host and version so upgrades
+        # and other hosts never see each other's entries
+        self._disk_cache: DiskCache | None = (
+            DiskCache(f"{api.api_root}|{api.system_version}") if use_disk_cache else None
+        )
 
-    def install_workflow(self, workflow: Workflow) -> None:
+    def install_workflow(self, workflow: Workflow, flush: bool = True) -> None:
         """Save a playbook or block in the current platform
 
         Args:
             workflow: A Playbook object to install
+            flush: Push the modification-time cache to the external context
+            after installing. Batch callers pass False and call
+            flush_context once at the end.
 
         """
         if self._workflow_exists(workflow.name):
-            self._update_workflow_if_needed(workflow)
+            self._update_workflow_if_needed(workflow, flush=flush)
 
         else:
-            self.install_new_workflow(workflow)
+            self.install_new_workflow(workflow, flush=flush)
+
+    def flush_context(self) -> None:
+        """Push the locally accumulated modification times to the external
+        context in one write.
+        """
+        self._mod_time_cache.push_local_to_external()
+
+    def prime_context_filter(self, workflow_names: set[str]) -> None:
+        """Precompute the names the mod-time cache is allowed to keep
+
+        Batch installs call this once so _filter_and_save_context stops
+        rebuilding the installed-playbook name set on every workflow.
+
+        Args:
+            workflow_names: Names of the workflows about to be installed
+
+        """
+        self._filter_names = frozenset(self._installed_playbooks) | frozenset(
+            workflow_names,
+        )
 
     def _workflow_exists(self, __workflow_name: str, /) -> bool:
         """Check if a workflow exists (is installed) in the platform."""
         return __workflow_name in self._installed_playbooks
 
-    def _update_workflow_if_needed(self, workflow: Workflow) -> None:
+    def _update_workflow_if_needed(self, workflow: Workflow, flush: bool = True) -> None:
         if not self._workflow_was_modified(workflow):
             self.logger.info(f"Skipped update for unchanged workflow '{workflow.name}'")
-            self._filter_and_save_context()
+            self._filter_and_save_context(flush=flush)
             return
 
         self._log_merge_conflicts(workflow)
-        self.update_local_workflow(workflow)
+        self.update_local_workflow(workflow, flush=flush)
 
     def _log_merge_conflicts(self, workflow: Workflow) -> None:
         if self._has_merge_conflicts(workflow):
@@ -629,12 +773,12 @@ class WorkflowInstaller:
         cached_time: int = self._mod_time_cache.get(workflow.name, -1)
         return workflow.modification_time > cached_time
 
-    def update_local_workflow(self, workflow: Workflow) -> None:
+    def update_local_workflow(self, workflow: Workflow, flush: bool = True) -> None:
         """Update an existing workflow in the platform."""
         self.logger.info(f"Updating existing workflow '{workflow.name}'")
         self._adjust_workflow_ids(workflow)
         self.api.save_playbook(workflow.raw_data)
-        self._save_workflow_mod_time_to_context(workflow)
+        self._save_workflow_mod_time_to_context(workflow, flush=flush)
         self.logger.info(f"Workflow '{workflow.name}' was updated successfully")
 
     def _adjust_workflow_ids(self, workflow: Workflow) -> None:
@@ -646,13 +790,13 @@ class WorkflowInstaller:
         self._copy_ids_from_existing_workflow(workflow, local_playbook)
         self._process_steps(workflow, local_playbook)
 
-    def install_new_workflow(self, workflow: Workflow) -> None:
+    def install_new_workflow(self, workflow: Workflow, flush: bool = True) -> None:
         """Install a new workflow to the platform."""
         self.logger.info(f"Installing new workflow '{workflow.name}'")
         self._define_workflow_as_new(workflow)
         self._process_steps(workflow)
         self.api.save_playbook(workflow.raw_data)
-        self._save_workflow_mod_time_to_context(workflow)
+        self._save_workflow_mod_time_to_context(workflow, flush=flush)
         self.logger.info(f"New workflow '{workflow.name}' was installed successfully")
 
     def _process_steps(
@@ -672,66 +816,82 @@ class WorkflowInstaller:
         # Used for patching step relations
         identifier_mappings = {}
         # Flatten steps to include action containers
-        old_steps = (
-            self._flatten_playbook_steps(installed_workflow.get("steps"))
-            if installed_workflow
-            else None
+        old_steps_by_key = {}
+        if installed_workflow:
+            old_steps_by_key = self._index_steps_by_key(
+                self._iter_playbook_steps(installed_workflow.get("steps")),
+            )
+        new_steps = self._flatten_playbook_steps(workflow.raw_data.get("steps"))
+        # Resolve all the instance ids the action steps will need in one
+        # batch instead of two round-trips per step
+        resolved_ids = self._prefetch_instance_ids(
+            (
+                step
+                for step in new_steps
+                if step.get("type") == 0
+                and step.get("actionProvider") == "Scripts"
+                and self._step_matching_key(step) not in old_steps_by_key
+            ),
+            workflow.environments,
         )
-        for step in self._flatten_playbook_steps(workflow.raw_data.get("steps")):
+        workflow_identifier = workflow.raw_data.get("identifier")
+        for step in new_steps:
             provider = step.get("actionProvider")
             step_type = step.get("type")
 
-            step["workflowIdentifier"] = workflow.raw_data.get("identifier")
+            step["workflowIdentifier"] = workflow_identifier
             # Take the step identifier if the same step instance name already exists.
-            existing_step = (
-                next(
-                    (x for x in old_steps if self._is_matching_step(x, step)),
-                    None,
-                )
-                if old_steps
-                else None
-            )
+            existing_step = old_steps_by_key.get(self._step_matching_key(step))
             if existing_step:
-                old_step_identifier = step.get("identifier")
-                identifier_mappings[old_step_identifier] = existing_step.get(
-                    "identifier",
-                )
-                step["identifier"] = existing_step.get("identifier")
-                step["originalStepIdentifier"] = existing_step.get(
+                # Bind the reused values once instead of re-probing the
+                # dicts throughout the branch
+                existing_identifier = existing_step.get("identifier")
+                existing_original_identifier = existing_step.get(
                     "originalStepIdentifier",
                 )
+                identifier_mappings[step.get("identifier")] = existing_identifier
+                step["identifier"] = existing_identifier
+                step["originalStepIdentifier"] = existing_original_identifier
 
                 step_debug_data = step.get("debugData")
-                if step_debug_data and step_debug_data.get("originalStepIdentifier"):
-                    step_debug_data["originalStepIdentifier"] = existing_step.get(
-                        "originalStepIdentifier",
-                    )
-                if step_debug_data and step_debug_data.get(
-                    "originalWorkflowIdentifier",
-                ):
-                    step_debug_data["originalWorkflowIdentifier"] = installed_workflow.get(
-                        "originalPlaybookIdentifier"
-                    )
+                if step_debug_data:
+                    if step_debug_data.get("originalStepIdentifier"):
+                        step_debug_data["originalStepIdentifier"] = existing_original_identifier
+                    if step_debug_data.get("originalWorkflowIdentifier"):
+                        step_debug_data["originalWorkflowIdentifier"] = installed_workflow.get(
+                            "originalPlaybookIdentifier"
+                        )
 
             if step_type == 0 and provider == "Scripts":  # Regular Action
                 self._assign_integration_instance_to_step(
                     step,
                     workflow.environments,
                     existing_step,
+                    resolved_ids,
                 )
             elif step_type == 5:  # Nested Workflow
                 self._link_nested_block_step(step)
 
-        for relation in workflow.raw_data.get("stepsRelations"):
-            if relation.get("fromStep") in identifier_mappings:
-                relation["fromStep"] = identifier_mappings.get(relation.get("fromStep"))
-            if relation.get("toStep") in identifier_mappings:
-                relation["toStep"] = identifier_mappings.get(relation.get("toStep"))
-
-        self._adjust_loop_keys_and_parameters(identifier_mappings, workflow)
-
-    def _adjust_loop_keys_and_parameters(self, identifier_mappings, workflow):
-        for step in self._flatten_playbook_steps(workflow.raw_data.get("steps")):
+        # New workflows have nothing remapped - skip the patch passes
+        if identifier_mappings:
+            mapping_get = identifier_mappings.get
+            for relation in workflow.raw_data.get("stepsRelations"):
+                new_from = mapping_get(relation.get("fromStep"))
+                new_to = mapping_get(relation.get("toStep"))
+                if new_from:
+                    relation["fromStep"] = new_from
+                if new_to:
+                    relation["toStep"] = new_to
+
+            self._adjust_loop_keys_and_parameters(identifier_mappings, new_steps)
+
+        # Drop the lazy parameter indexes so they don't leak into the
+        # payload save_playbook sends to the platform
+        for step in new_steps:
+            step.pop(_PARAM_INDEX_KEY, None)
+
+    def _adjust_loop_keys_and_parameters(self, identifier_mappings, steps):
+        for step in steps:
             if step.get("startLoopStepIdentifier"):
                 mapped_id = identifier_mappings.get(step["startLoopStepIdentifier"])
                 if mapped_id:
@@ -756,15 +916,27 @@ class WorkflowInstaller:
                     if mapped_id:
                         param["value"] = mapped_id
 
-    def _save_workflow_mod_time_to_context(self, workflow: Workflow) -> None:
+    def _save_workflow_mod_time_to_context(
+        self,
+        workflow: Workflow,
+        flush: bool = True,
+    ) -> None:
         self.refresh_cache_item("playbooks")
         new_mod_time: int = self._get_local_workflow_mod_time(workflow.name, -1)
-        self._mod_time_cache[workflow.name] = new_mod_time
-        self._filter_and_save_context()
-
-    def _filter_and_save_context(self) -> None:
-        self._mod_time_cache.filter_items(set(self._installed_playbooks))
-        self._mod_time_cache.push_local_to_external()
+        with self._state_lock:
+            self._mod_time_cache[workflow.name] = new_mod_time
+        self._filter_and_save_context(flush=flush)
+
+    def _filter_and_save_context(self, flush: bool = True) -> None:
+        names = (
+            self._filter_names
+            if self._filter_names is not None
+            else set(self._installed_playbooks)
+        )
+        with self._state_lock:
+            self._mod_time_cache.filter_items(names)
+            if flush:
+                self._mod_time_cache.push_local_to_external()
 
     def _get_local_workflow_mod_time(
         self,
@@ -778,30 +950,116 @@ class WorkflowInstaller:
     @property
     def _installed_playbooks(self) -> dict[str, dict[str, Any]]:
         """Currently installed playbooks and blocks"""
-        if "playbooks" not in self._cache:
-            self._cache["playbooks"] = {
-                x.get("name"): x for x in self.api.get_playbooks(chronicle_soar=self.chronicle_soar)
+        # Built into a local and returned directly - re-reading the cache
+        # after the miss check races with refresh_cache_item from parallel
+        # installs and could hand back None
+        playbooks: dict[str, dict[str, Any]] | None = self._cache.get("playbooks")
+        if playbooks is None:
+            playbooks = {}
+            for playbook in self.api.get_playbooks(chronicle_soar=self.chronicle_soar):
+                name = playbook.get("name")
+                if name in playbooks:
+                    # Name collisions silently mis-match in _workflow_exists
+                    self.logger.warn(
+                        f"Multiple installed playbooks are named '{name}' - "
+                        "name-based matching may pick the wrong one",
+                    )
+                playbooks[name] = playbook
+            self._cache["playbooks"] = playbooks
+        return playbooks
+
+    @property
+    def _installed_block_playbooks(self) -> dict[str, dict[str, Any]]:
+        """Currently installed playbooks of type BLOCK, indexed by name"""
+        blocks: dict[str, dict[str, Any]] | None = self._cache.get("block_playbooks")
+        if blocks is None:
+            blocks = {
+                name: playbook
+                for name, playbook in self._installed_playbooks.items()
+                if playbook.get("playbookType") == WorkflowTypes.BLOCK.value
             }
-        return self._cache.get("playbooks")
+            self._cache["block_playbooks"] = blocks
+        return blocks
 
     @property
     def _playbook_categories(self) -> dict:
         """Currently configured playbook categories"""
-        if "categories" not in self._cache:
-            self._cache["categories"] = {
-                x.get("name"): x for x in self.api.get_playbook_categories()
-            }
-        return self._cache.get("categories")
+        categories: dict | None = self._cache.get("categories")
+        if categories is None:
+            if self._disk_cache is not None:
+                raw = self._disk_cache.get_or_fetch(
+                    "categories",
+                    self.api.get_playbook_categories,
+                )
+            else:
+                raw = self.api.get_playbook_categories()
+            categories = {x.get("name"): x for x in raw}
+            self._cache["categories"] = categories
+        return categories
 
     def refresh_cache_item(self, item_name) -> None:
-        if item_name in self._cache:
-            del self._cache[item_name]
+        # pop is atomic, so concurrent refreshes of the same item are safe
+        self._cache.pop(item_name, None)
+        if item_name == "playbooks":
+            # The block index is derived from the playbook list
+            self._cache.pop("block_playbooks", None)
+        if self._disk_cache is not None:
+            self._disk_cache.invalidate(item_name)
+
+    def _prefetch_instance_ids(
+        self,
+        steps,
+        environments: list,
+    ) -> dict[tuple, str | None]:
+        """Batch-resolve the integration instance ids referenced by steps
+
+        Args:
+            steps: The action steps that still need an instance assigned
+            environments: The playbook's assigned environments
+
+        Results (including misses) are memoized under the "instance_ids"
+        cache item, so playbooks reusing the same instances don't repeat
+        the round-trips.
+
+        Returns:
+            A dict keyed by (integration, display name, environments tuple)
+
+        """
+        env_key = tuple(environments)
+        queries = []
+        for step in steps:
+            integration = step.get("integration")
+            for parameter_name, display_name_key in (
+                ("IntegrationInstance", "InstanceDisplayName"),
+                ("FallbackIntegrationInstance", "FallbackInstanceDisplayName"),
+            ):
+                display_name = self._get_instance_display_name(
+                    step,
+                    parameter_name,
+                    display_name_key,
+                )
+                # A missing display name can never match a named instance -
+                # don't even queue the query
+                if display_name is not None:
+                    queries.append((integration, display_name, env_key))
+
+        resolved_ids = self._cache.setdefault("instance_ids", {})
+        misses = [query for query in queries if query not in resolved_ids]
+        if misses:
+            resolved_ids.update(
+                self.api.get_integration_instance_ids_by_names(
+                    self.chronicle_soar,
+                    misses,
+                ),
+            )
+        return resolved_ids
 
     def _assign_integration_instance_to_step(
         self,
         step: dict,
         environments: list,
         existing_step: dict = None,
+        resolved_ids: dict[tuple, str | None] = None,
     ) -> None:
         """Reconfigure an integration instance of a workflow step.
 
@@ -818,6 +1076,8 @@ class WorkflowInstaller:
             environments: Playbook assigned environments, for searching integration instances
             existing_step: Optional - if the step is already defined, take the integration instance
             from it instead
+            resolved_ids: Instance ids prefetched by _prefetch_instance_ids, keyed by
+            (integration, display name, environments tuple)
 
         """
         if existing_step:
@@ -837,6 +1097,7 @@ class WorkflowInstaller:
             )
             return
 
+        integration = step.get("integration")
         instance_display_name = self._get_instance_display_name(
             step,
             "IntegrationInstance",
@@ -849,28 +1110,23 @@ class WorkflowInstaller:
             "FallbackInstanceDisplayName",
         )
 
-        fallback_instance_id = self.api.get_integration_instance_id_by_name(
-            self.chronicle_soar,
-            step.get("integration"),
-            environments=environments,
-            display_name=fallback_instance_display_name,
-            consider_404_to_none=True,
+        if resolved_ids is None:
+            resolved_ids = {}
+        env_key = tuple(environments)
+        fallback_instance_id = resolved_ids.get(
+            (integration, fallback_instance_display_name, env_key),
         )
         # If the playbook is for one specific environment, choose the first integration instance
         # from that environment. Otherwise, set the step to dynamic mode and set the first shared
         # integration instance as fallback
         if len(environments) == 1 and environments[0] != ALL_ENVIRONMENTS_IDENTIFIER:
             integration_instances = self._find_integration_instances_for_step(
-                step.get("integration"),
+                integration,
                 environments[0],
             )
             if integration_instances:
-                instance_id = self.api.get_integration_instance_id_by_name(
-                    self.chronicle_soar,
-                    step.get("integration"),
-                    environments=environments,
-                    display_name=instance_display_name,
-                    consider_404_to_none=True,
+                instance_id = resolved_ids.get(
+                    (integration, instance_display_name, env_key),
                 )
                 self._set_step_parameter_by_name(
                     step,
@@ -884,7 +1140,7 @@ class WorkflowInstaller:
                 )
         else:
             integration_instances = self._find_integration_instances_for_step(
-                step.get("integration"),
+                integration,
                 ALL_ENVIRONMENTS_IDENTIFIER,
             )
             self._set_step_parameter_by_name(
@@ -935,18 +1191,58 @@ class WorkflowInstaller:
 
         """
         cache_key = f"integration_instances_{environment}"
-        if cache_key not in self._cache:
-            self._cache[cache_key] = self.api.get_integrations_instances(
+        by_integration = self._cache.get(cache_key)
+        if by_integration is None and self._disk_cache is not None:
+            by_integration = self._disk_cache.get(cache_key)
+            if by_integration is not None:
+                self._cache[cache_key] = by_integration
+        if by_integration is None:
+            # One fetch and one grouping pass per environment; every step
+            # lookup afterwards is a single dict probe
+            grouped: dict[str, list] = {}
+            for instance in self.api.get_integrations_instances(
                 chronicle_soar=self.chronicle_soar,
                 environment=environment,
-            )
+            ):
+                if instance.is_configured:
+                    # Keep only the fields the assignment path reads, so
+                    # the grouped index is JSON-serializable for the disk
+                    # cache
+                    grouped.setdefault(instance.integration_identifier, []).append(
+                        {
+                            "identifier": instance.get("identifier"),
+                            "instanceName": instance.get("instanceName"),
+                        },
+                    )
+            # methodcaller is C-level - no Python frame per key call
+            instance_name = methodcaller("get", "instanceName")
+            for instances in grouped.values():
+                instances.sort(key=instance_name)
+            by_integration = self._cache[cache_key] = grouped
+            if self._disk_cache is not None:
+                self._disk_cache.set(cache_key, grouped)
 
-        instances = self._cache.get(cache_key)
-        instances.sort(key=lambda x: x.get("instanceName"))
+        return by_integration.get(integration_name, [])
 
-        return [
-            x for x in instances if x.integration_identifier == integration_name and x.is_configured
-        ]
+    @staticmethod
+    def _iter_playbook_steps(steps: list):
+        """Iterate playbook steps, expanding parallel action containers
+
+        Streams the steps without building an intermediate list - callers
+        that only walk the steps once should prefer this over
+        _flatten_playbook_steps.
+
+        Args:
+            steps: The playbook steps to iterate
+
+        Yields:
+            The steps, with each container's parallel actions before it
+
+        """
+        for step in steps:
+            if step.get("actionProvider") == "ParallelActionsContainer":
+                yield from step.get("parallelActions")
+            yield step
 
     @staticmethod
     def _flatten_playbook_steps(steps: list) -> list[dict]:
@@ -959,12 +1255,7 @@ class WorkflowInstaller:
             Flattened list of steps
 
         """
-        flat_steps = []
-        for step in steps:
-            if step.get("actionProvider") == "ParallelActionsContainer":
-                flat_steps.extend(step.get("parallelActions"))
-            flat_steps.append(step)
-        return flat_steps
+        return list(WorkflowInstaller._iter_playbook_steps(steps))
 
     def _set_step_parameter_by_name(
         self,
@@ -983,11 +1274,49 @@ class WorkflowInstaller:
         self._get_step_parameter_by_name(step, parameter_name)["value"] = parameter_value
 
     @staticmethod
-    def _is_matching_step(step_1: SingleJson, step_2: SingleJson) -> bool:
-        """Checks if step 'step_1' matches the key attributes of 'step_2'."""
-        return step_1.get("instanceName") == step_2.get("instanceName") and step_1.get(
-            "actionProvider"
-        ) == step_2.get("actionProvider")
+    def _step_matching_key(step: SingleJson) -> tuple:
+        """Key attributes identifying the same step across workflow versions."""
+        return step.get("instanceName"), step.get("actionProvider")
+
+    @staticmethod
+    def _index_steps_by_key(steps) -> dict[tuple, dict]:
+        """Index steps by their matching key for O(1) cross-version matching
+
+        The first occurrence of a key wins, matching the linear scan this
+        index replaced.
+
+        Args:
+            steps: The steps to index
+
+        Returns:
+            A dict mapping (instance name, action provider) keys to steps
+
+        """
+        index: dict[tuple, dict] = {}
+        for step in steps:
+            index.setdefault(WorkflowInstaller._step_matching_key(step), step)
+        return index
+
+    @staticmethod
+    def _params_index(step: dict) -> dict[str, dict]:
+        """Index a step's parameters by name, lazily cached on the step
+
+        The index maps parameter names to the parameter dicts themselves,
+        so mutating an indexed parameter updates the step in place.
+
+        Args:
+            step: The step whose parameters to index
+
+        Returns:
+            A dict mapping parameter names to parameter dicts
+
+        """
+        index = step.get(_PARAM_INDEX_KEY)
+        if index is None:
+            index = step[_PARAM_INDEX_KEY] = {
+                x.get("name"): x for x in step.get("parameters") or ()
+            }
+        return index
 
     @staticmethod
     def _get_step_parameter_by_name(step: dict, parameter_name: str) -> dict | None:
@@ -1001,10 +1330,7 @@ class WorkflowInstaller:
             The parameter dict instance, or None if not found
 
         """
-        return next(
-            (x for x in step.get("parameters") if x.get("name") == parameter_name),
-            None,
-        )
+        return WorkflowInstaller._params_index(step).get(parameter_name)
 
     @staticmethod
     def _copy_ids_from_existing_workflow(workflow: Workflow, other: dict) -> None:
@@ -1027,6 +1353,28 @@ class WorkflowInstaller:
         workflow.raw_data["categoryName"] = other.get("categoryName")
         workflow.raw_data["categoryId"] = other.get("categoryId")
 
+    def _next_uuid(self) -> str:
+        """Draw a random UUID string from a preallocated pool
+
+        uuid4 issues an os.urandom syscall per call; defining a workflow
+        needs two UUIDs and bulk imports define many, so the entropy is
+        drawn for _UUID_POOL_SIZE ids at a time and sliced. Version and
+        variant bits are set by the UUID constructor, so the ids are
+        regular version-4 UUIDs.
+
+        Returns:
+            A random UUID string
+
+        """
+        with self._state_lock:
+            if not self._uuid_pool:
+                entropy = os.urandom(16 * _UUID_POOL_SIZE)
+                self._uuid_pool.extend(
+                    str(uuid.UUID(bytes=entropy[i : i + 16], version=4))
+                    for i in range(0, len(entropy), 16)
+                )
+            return self._uuid_pool.popleft()
+
     def _define_workflow_as_new(self, workflow: Workflow) -> None:
         """Generate a new identifier and create the playbook category if it doesn't exist
 
@@ -1034,17 +1382,25 @@ class WorkflowInstaller:
             workflow: A new workflow to reconfigure
 
         """
-        workflow.raw_data["identifier"] = workflow.raw_data["originalPlaybookIdentifier"] = str(
-            uuid.uuid4()
+        workflow.raw_data["identifier"] = workflow.raw_data["originalPlaybookIdentifier"] = (
+            self._next_uuid()
         )
         workflow.raw_data["trigger"]["id"] = 0
-        workflow.raw_data["trigger"]["identifier"] = str(uuid.uuid4())
-
-        if workflow.category not in self._playbook_categories:
-            category = self.api.create_playbook_category(workflow.category)
-            self.refresh_cache_item("categories")
-        else:
-            category = self._playbook_categories.get(workflow.category)
+        workflow.raw_data["trigger"]["identifier"] = self._next_uuid()
+
+        with self._state_lock:
+            categories = self._playbook_categories
+            category = categories.get(workflow.category)
+            if category is None:
+                category = self.api.create_playbook_category(workflow.category)
+                # Record the new category in place - refetching the whole
+                # category list for one addition is wasted round-trips
+                categories[workflow.category] = category
+                if self._disk_cache is not None:
+                    # The persisted list doesn't know the new category -
+                    # drop it so the next run refetches instead of
+                    # re-creating an existing category
+                    self._disk_cache.invalidate("categories")
 
         workflow.raw_data["categoryId"] = category.get("id")
 
@@ -1055,16 +1411,13 @@ class WorkflowInstaller:
             step: A nested workflow step to reconfigure
 
         """
-        if (
-            step.get("name") in self._installed_playbooks
-            and self._installed_playbooks[step.get("name")].get("playbookType")
-            == WorkflowTypes.BLOCK.value
-        ):
-            nested_workflow_identifier = self._get_step_parameter_by_name(
-                step,
-                "NestedWorkflowIdentifier",
-            )
-            if nested_workflow_identifier:
-                nested_workflow_identifier["value"] = self._installed_playbooks[
-                    step.get("name")
-                ].get("identifier")
+        block = self._installed_block_playbooks.get(step.get("name"))
+        if block is None:
+            return
+
+        nested_workflow_identifier = self._get_step_parameter_by_name(
+            step,
+            "NestedWorkflowIdentifier",
+        )
+        if nested_workflow_identifier:
+            nested_workflow_identifier["value"] = block.get("identifier")
@@ -14,12 +14,16 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from urllib.parse import urljoin
 from typing import TYPE_CHECKING
 
 import requests
 from packaging import version
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from urllib3.util.retry import Retry
 from TIPCommon.rest.soar_api import (
     add_case_stage,
     add_case_tag,
@@ -78,6 +82,15 @@ class BaseUrlSession(requests.Session):
         if base_url:
             self.base_url = base_url
         super(BaseUrlSession, self).__init__()
+        # Keep-alive connection pool sized for the concurrent fetch loops in
+        # Push Content - avoids a fresh TLS handshake per API call
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
 
     def request(self, method, url, *args, **kwargs):
         url = self.create_url(url)
@@ -107,6 +120,7 @@ class SiemplifyApiClient:
         self.session.verify = use_ssl
         self._version = None
         self._bearer_token = None
+        self._cache = {}
         self.siemplify_soar = siemplify_soar
         if smp_username and smp_password:
             self._bearer_token = self.get_bearer_token(smp_password, smp_username)
@@ -179,12 +193,23 @@ class SiemplifyApiClient:
         self.validate_response(res)
         return res.content
 
+    def clear_cache(self) -> None:
+        self._cache = {}
+
+    def refresh_cache_item(self, item_name) -> None:
+        for key in [k for k in self._cache if k[0] == item_name]:
+            del self._cache[key]
+
     def get_store_data(self):
-        store = self.session.get("store/GetIntegrationsStoreData")
-        self.validate_response(store)
-        powerups = self.session.get("store/GetPowerUpsStoreData")
-        self.validate_response(powerups)
-        return store.json()["integrations"] + powerups.json()["integrations"]
+        if ("store_data",) not in self._cache:
+            store = self.session.get("store/GetIntegrationsStoreData")
+            self.validate_response(store)
+            powerups = self.session.get("store/GetPowerUpsStoreData")
+            self.validate_response(powerups)
+            self._cache[("store_data",)] = (
+                store.json()["integrations"] + powerups.json()["integrations"]
+            )
+        return self._cache[("store_data",)]
 
     def get_environments(self, siemplify):
         return get_environments(siemplify)
@@ -213,12 +238,23 @@ class SiemplifyApiClient:
             json=payload,
         )
         self.validate_response(res)
+        self.refresh_cache_item("store_data")
         return True
 
     def export_package(self, integration):
-        res = self.session.get(f"ide/ExportPackage/{integration}")
+        """Download an integration package into a seekable buffer.
+
+        The download is streamed in chunks so the package bytes are held
+        only once (ZipFile consumers need a seekable file-like object, so
+        a fully lazy stream is not an option here).
+        """
+        res = self.session.get(f"ide/ExportPackage/{integration}", stream=True)
         self.validate_response(res)
-        return res.content
+        buffer = BytesIO()
+        for chunk in res.iter_content(chunk_size=64 * 1024):
+            buffer.write(chunk)
+        buffer.seek(0)
+        return buffer
 
     def import_package(self, integration_name, b64_blob):
         data = {
@@ -228,11 +264,13 @@ class SiemplifyApiClient:
         }
         res = self.session.post("ide/ImportPackage", json=data)
         self.validate_response(res)
+        self.refresh_cache_item("ide_cards")
         return res.content
 
     def update_ide_item(self, input_json):
         res = self.session.post("ide/AddOrUpdateItem", json=input_json)
         self.validate_response(res)
+        self.refresh_cache_item("ide_cards")
         return res.json()
 
     def get_integrations_instances(
@@ -292,11 +330,17 @@ class SiemplifyApiClient:
         )
 
     def get_ide_cards(self, include_staging=False):
-        res = self.session.get("ide/GetIdeItemCards", verify=False)
-        self.validate_response(res)
-        if include_staging:
-            return res.json()
-        return [x for x in res.json() if not x.get("productionIntegrationIdentifier")]
+        # Memoized - several features read the same card list in one run.
+        # Keyed on primitive args only; invalidated by the IDE write methods.
+        cache_key = ("ide_cards", include_staging)
+        if cache_key not in self._cache:
+            res = self.session.get("ide/GetIdeItemCards", verify=False)
+            self.validate_response(res)
+            cards = res.json()
+            if not include_staging:
+                cards = [x for x in cards if not x.get("productionIntegrationIdentifier")]
+            self._cache[cache_key] = cards
+        return self._cache[cache_key]
 
     def get_ide_item(self, item_id, item_type):
         query = {"itemId": item_id, "ideItemType": item_type}
@@ -712,3 +756,42 @@ class SiemplifyApiClient:
             return None
 
         return res.get("identifier")
+
+    def get_integration_instance_ids_by_names(
+        self,
+        chronicle_soar,
+        queries,
+    ) -> dict[tuple, str | None]:
+        """Resolve many integration instance ids in one batch.
+
+        The platform has no multi-lookup endpoint, so the queries are
+        deduplicated and resolved over the session's connection pool
+        instead of one round-trip per playbook step.
+
+        Args:
+            queries: An iterable of (integration_name, display_name,
+                environments) tuples; environments must be hashable.
+
+        Returns:
+            dict: Maps each distinct query tuple to its instance id, or None
+            if the instance doesn't exist.
+
+        """
+        # Queries without a display name can never match a named instance
+        distinct = list({query for query in queries if query[1] is not None})
+
+        def resolve(query: tuple) -> str | None:
+            integration_name, display_name, environments = query
+            return self.get_integration_instance_id_by_name(
+                chronicle_soar,
+                integration_name,
+                environments=list(environments),
+                display_name=display_name,
+                consider_404_to_none=True,
+            )
+
+        if len(distinct) < 4:
+            return {query: resolve(query) for query in distinct}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return dict(zip(distinct, executor.map(resolve, distinct)))
@@ -16,10 +16,13 @@ from __future__ import annotations
 
 import collections
 import copy
+import hashlib
 import json
+import time
 from collections.abc import Iterable, Iterator, MutableMapping, MutableSequence
 from collections.abc import Set as AbstractSet
-from typing import Generic, Protocol, TypeAlias, TypeVar
+from pathlib import Path
+from typing import Any, Generic, Protocol, TypeAlias, TypeVar
 
 import SiemplifyBase, SiemplifyUtils
 from SiemplifyAction import SiemplifyAction
@@ -243,6 +246,68 @@ class Cache(MutableMapping[_KT, _VT], Generic[_KT, _VT]):
         self._context.set_context(key, value)
 
 
+class DiskCache:
+    """JSON file-backed cache that survives across runs.
+
+    Each key is stored as its own file under ~/.cache/gitsync/ together
+    with when it was fetched; entries older than the TTL are treated as
+    misses. The namespace separates caches of different platforms (e.g.
+    host and version), so stale data is never served across hosts or
+    upgrades. Every filesystem or serialization error degrades to a cache
+    miss - the cache is an optimization, never a requirement.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int = 300) -> None:
+        digest: str = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+        self._directory: Path = Path.home() / ".cache" / "gitsync" / digest
+        self._ttl: int = ttl_seconds
+
+    def get(self, key: str) -> Any | None:
+        """Get a cached value, or None if missing, expired or unreadable."""
+        try:
+            entry: dict = json.loads(self._path(key).read_text(encoding="utf-8"))
+            if time.time() - entry["fetched_at"] > self._ttl:
+                return None
+
+            return entry["data"]
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, data: Any) -> None:
+        """Store a JSON-serializable value with its fetch time."""
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            entry: JsonStr = json.dumps(
+                {"key": key, "fetched_at": time.time(), "data": data},
+                separators=(",", ":"),
+            )
+            self._path(key).write_text(entry, encoding="utf-8")
+
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def get_or_fetch(self, key: str, fetch_fn) -> Any:
+        """Get a cached value, fetching and storing it on a miss."""
+        data: Any | None = self.get(key)
+        if data is None:
+            data = fetch_fn()
+            self.set(key, data)
+
+        return data
+
+    def invalidate(self, key: str) -> None:
+        """Drop a cached value; missing entries are ignored."""
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _path(self, key: str) -> Path:
+        digest: str = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self._directory / f"{digest}.json"
+
+
 def _load_record(row_value: JsonStr, /) -> _Record:
     _record: _Record = {}
     if row_value:
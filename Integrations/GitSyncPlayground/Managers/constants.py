@@ -25,14 +25,16 @@ DEFAULT_USERNAME = "None"
 DEFAULT_AUTHOR = "GitSync <gitsync@siemplify.co>"
 COMMIT_AUTHOR_REGEX = r"[A-Za-z ,.'-]+ <[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}>"
 
-IGNORED_INTEGRATIONS = ["GitSync", "Siemplify", "SiemplifyUtilities"]
-IGNORED_JOBS = [
+IGNORED_INTEGRATIONS = frozenset({"GitSync", "Siemplify", "SiemplifyUtilities"})
+IGNORED_JOBS = frozenset({
     "Actions Monitor",
     "Connectors Monitor",
     "ETL Monitor",
     "Jobs Monitor",
     "Machine Resource Utilization",
-]
+})
+# Tuple so a single startswith call covers all ignored prefixes
+IGNORED_JOB_PREFIXES = ("Cases Collector DB", "Logs Collector")
 
 AVAILABLE_CONTENT = [
     "Integrations",
@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import re
 from typing import TYPE_CHECKING, Any
@@ -43,20 +44,39 @@ from constants import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
 
     from SiemplifyApiClient import SiemplifyApiClient
     from TIPCommon.types import ChronicleSOAR
 
 
 class File:
-    """Represents a common file object used by the GitManager"""
+    """Represents a common file object used by the GitManager
 
-    def __init__(self, path: str, contents: str | bytes):
+    Contents may be given as a zero-argument callable, in which case the
+    bytes are only materialized when the content attribute is first read.
+    """
+
+    def __init__(self, path: str, contents: str | bytes | Callable[[], bytes]):
         self.path = path
-        if isinstance(contents, str):
-            contents = contents.encode("utf-8")
-        self.content = contents
+        if callable(contents):
+            self._contents = None
+            self._loader = contents
+        else:
+            if isinstance(contents, str):
+                contents = contents.encode("utf-8")
+            self._contents = contents
+            self._loader = None
+
+    @property
+    def content(self) -> bytes:
+        if self._contents is None and self._loader is not None:
+            contents = self._loader()
+            if isinstance(contents, str):
+                contents = contents.encode("utf-8")
+            self._contents = contents
+            self._loader = None
+        return self._contents
 
     def __repr__(self):
         return f"{{Path: {self.path} Contents head: {self.content[:15]}...}}"
@@ -67,27 +87,28 @@ class Content:
         self.readme: str | None = None
 
 
+def _get_arg_with_multiple_names(
+    args: dict[str, Any],
+    arg_name_options: tuple[str, ...],
+    default_value: Any,
+):
+    for name in arg_name_options:
+        value = args.get(name)
+        if value:
+            return value
+    return default_value
+
+
 class Metadata:
     def __init__(self, **kwargs):
-        def _get_arg_with_multiple_names(
-            args: dict[str, Any],
-            arg_name_options: list[str],
-            default_value: Any,
-        ):
-            for name in arg_name_options:
-                value = args.get(name)
-                if value:
-                    return value
-            return default_value
-
         self.system_version = _get_arg_with_multiple_names(
             kwargs,
-            ["system_version", "systemVersion"],
+            ("system_version", "systemVersion"),
             "",
         )
         self.readme_addons = _get_arg_with_multiple_names(
             kwargs,
-            ["readme_addons", "readmeAddons"],
+            ("readme_addons", "readmeAddons"),
             {
                 "Integration": {},
                 "Mappings": {},
@@ -98,6 +119,8 @@ class Metadata:
             },
         )
         self.settings = kwargs.get("settings", {"update_root_readme": True})
+        # Content hashes of installed integrations, for skipping unchanged ones
+        self.content_hashes = kwargs.get("content_hashes", {})
 
     def get_readme_addon(self, content_type: str, content_name: str) -> str | None:
         if content_type not in self.readme_addons:
@@ -121,6 +144,20 @@ class Metadata:
             raise KeyError(f"Setting {name} not found")
         return self.settings[name]
 
+    def get_content_hash(self, identifier: str) -> str | None:
+        return self.content_hashes.get(identifier)
+
+    def set_content_hash(self, identifier: str, content_hash: str) -> None:
+        self.content_hashes[identifier] = content_hash
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "system_version": self.system_version,
+            "readme_addons": self.readme_addons,
+            "settings": self.settings,
+            "content_hashes": self.content_hashes,
+        }
+
 
 class Connector(Content):
     def __init__(self, connector: dict):
@@ -276,6 +313,19 @@ class Integration(Content):
     def get_zip_as_base64(self):
         return base64.b64encode(self.zip_buffer.getvalue()).decode("utf-8")
 
+    @property
+    def content_hash(self) -> str:
+        """Digest of the packed files, for change detection
+
+        Hashes member names and contents rather than the zip bytes,
+        which embed non-deterministic timestamps.
+        """
+        digest = hashlib.sha256()
+        for name in sorted(self.zipfile.namelist()):
+            digest.update(name.encode("utf-8"))
+            digest.update(self.zipfile.read(name))
+        return digest.hexdigest()
+
     def generate_readme(self, additional_info: str = None):
         env = JinjaEnvironment()
         env.filters.update(